@@ -1,6 +1,7 @@
 import streamlit as st
 import os
 import sys
+import uuid
 from pathlib import Path
 
 # Add the project root to Python path
@@ -11,9 +12,20 @@ from core.module_manager import ModuleManager
 from core.chat_manager import ChatManager
 from bot_builder import show_bot_builder
 
+# Persist conversations and learning off the response path
+ChatManager.enable_write_behind()
+
+# Pick up bots added or edited in moduls/ without a manual refresh
+ModuleManager.shared().start_watcher()
+
 # Initialize session state
 if 'module_manager' not in st.session_state:
-    st.session_state.module_manager = ModuleManager()
+    # Modules are scanned and instantiated once per process and shared by all sessions
+    st.session_state.module_manager = ModuleManager.shared()
+    
+if 'session_id' not in st.session_state:
+    # Keys this session's conversation memory inside the shared module instances
+    st.session_state.session_id = uuid.uuid4().hex
     
 if 'chat_manager' not in st.session_state:
     st.session_state.chat_manager = ChatManager()
@@ -258,6 +270,10 @@ def main():
                             st.markdown(f"**Average Confidence:** {stats.get('avg_confidence', 0):.2f}")
                         if 'active_patterns' in stats:
                             st.markdown(f"**Active Patterns:** {stats.get('active_patterns', 0)}")
+                    
+                    stream_metrics = st.session_state.module_manager.get_stream_metrics(selected_module)
+                    if stream_metrics.get('avg_ttfb_ms'):
+                        st.markdown(f"**Avg. Time to First Chunk:** {stream_metrics['avg_ttfb_ms']:.1f} ms")
             
             # Clear chat button
             if st.button("🗑️ Clear Chat", use_container_width=True):
@@ -313,32 +329,31 @@ def main():
             st.write(user_input)
         
         with st.chat_message("assistant"):
-            with st.spinner("Generating response..."):
-                try:
-                    response = st.session_state.module_manager.get_response(
-                        st.session_state.current_module,
-                        user_input,
-                        st.session_state.chat_history[:-1]  # Exclude the current user message
-                    )
-                    
-                    st.write(response)
-                    
-                    # Add AI response to history
-                    st.session_state.chat_history.append({
-                        "role": "assistant",
-                        "content": response
-                    })
-                    
-                    # Save conversation for learning
-                    st.session_state.chat_manager.save_conversation(
-                        st.session_state.current_module,
-                        user_input,
-                        response
-                    )
-                    
-                except Exception as e:
-                    st.error(f"Error generating response: {str(e)}")
-                    st.session_state.chat_history.pop()  # Remove user message if error occurred
+            try:
+                # Render chunks as the module produces them
+                response = st.write_stream(st.session_state.module_manager.get_response_stream(
+                    st.session_state.current_module,
+                    user_input,
+                    st.session_state.chat_history[:-1],  # Exclude the current user message
+                    session_id=st.session_state.session_id
+                ))
+                
+                # Add AI response to history
+                st.session_state.chat_history.append({
+                    "role": "assistant",
+                    "content": response
+                })
+                
+                # Save conversation for learning
+                st.session_state.chat_manager.save_conversation(
+                    st.session_state.current_module,
+                    user_input,
+                    response
+                )
+                
+            except Exception as e:
+                st.error(f"Error generating response: {str(e)}")
+                st.session_state.chat_history.pop()  # Remove user message if error occurred
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,62 @@
+"""Benchmark cold-session latency: a per-session ModuleManager vs the shared one"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.module_manager import ModuleManager
+
+MODULE = "A.v.A"
+FIRST_MESSAGE = "hello, what can you do?"
+
+def per_session_manager(session_id: str) -> float:
+    """Cold session as app.py used to start one: a fresh ModuleManager and module instances"""
+    start = time.perf_counter()
+    manager = ModuleManager()
+    manager.get_response(MODULE, FIRST_MESSAGE, [])
+    return time.perf_counter() - start
+
+def shared_manager(session_id: str) -> float:
+    """Cold session on the process-wide ModuleManager"""
+    start = time.perf_counter()
+    manager = ModuleManager.shared()
+    manager.get_response(MODULE, FIRST_MESSAGE, [], session_id=session_id)
+    return time.perf_counter() - start
+
+def run(label: str, cold_session, sessions: int):
+    """Time the first request of each new session"""
+    timings = [cold_session(uuid.uuid4().hex) for _ in range(sessions)]
+    print(f"{label:<22} first {timings[0] * 1000:8.2f} ms   "
+          f"median {statistics.median(timings) * 1000:8.2f} ms   "
+          f"max {max(timings) * 1000:8.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=50, help="cold sessions to simulate")
+    args = parser.parse_args()
+    
+    # Work on a copy of the modules so benchmark learning data stays out of data/
+    workdir = tempfile.mkdtemp(prefix="bench_cold_session_")
+    try:
+        shutil.copytree(project_root / "moduls", Path(workdir) / "moduls",
+                        ignore=shutil.ignore_patterns("__pycache__"))
+        os.chdir(workdir)
+        
+        print(f"{args.sessions} cold sessions, first message to {MODULE}")
+        run("per-session manager", per_session_manager, args.sessions)
+        run("shared manager", shared_manager, args.sessions)
+    finally:
+        os.chdir(project_root)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark the JSON API: chat requests per second over keep-alive connections"""
+import argparse
+import http.client
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.chat_manager import ChatManager
+from core.module_manager import ModuleManager
+from server import create_server
+
+MODULE = "A.v.A"
+MESSAGES = ["hello, what can you do?", "what is 12 * 7", "why is the sky blue", "tell me about physics"]
+
+def client(port: int, requests: int, timings: list):
+    """Send chat requests over one keep-alive connection, as one session"""
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    session_id = uuid.uuid4().hex
+    try:
+        for i in range(requests):
+            body = json.dumps({'module': MODULE, 'message': MESSAGES[i % len(MESSAGES)], 'session_id': session_id})
+            start = time.perf_counter()
+            conn.request("POST", "/chat", body, {'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            timings.append(time.perf_counter() - start)
+            if response.status != 200:
+                raise RuntimeError(f"/chat answered {response.status}")
+    finally:
+        conn.close()
+
+def run(port: int, client_count: int, requests: int, workers: int):
+    """Time chat requests from concurrent keep-alive clients"""
+    timings = []
+    clients = [threading.Thread(target=client, args=(port, requests, timings))
+               for _ in range(client_count)]
+    start = time.perf_counter()
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    print(f"{len(timings)} requests from {client_count} connections to {MODULE} "
+          f"({workers} server workers)")
+    print(f"throughput {len(timings) / elapsed:10.1f} req/s   "
+          f"median {statistics.median(timings) * 1000:8.2f} ms   "
+          f"max {max(timings) * 1000:8.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, nargs="+", default=[8, 64],
+                        help="concurrent keep-alive connections, one run per value")
+    parser.add_argument("--requests", type=int, default=200, help="chat requests per connection")
+    parser.add_argument("--workers", type=int, default=16, help="server worker threads")
+    args = parser.parse_args()
+    
+    # Work on a copy of the modules so benchmark learning data stays out of data/
+    workdir = tempfile.mkdtemp(prefix="bench_server_")
+    server = None
+    try:
+        shutil.copytree(project_root / "moduls", Path(workdir) / "moduls",
+                        ignore=shutil.ignore_patterns("__pycache__"))
+        os.chdir(workdir)
+        
+        ChatManager.enable_write_behind()
+        server = create_server(port=0, workers=args.workers, module_manager=ModuleManager())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+        
+        for client_count in args.clients:
+            run(port, client_count, args.requests, args.workers)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        ChatManager.disable_write_behind()
+        os.chdir(project_root)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
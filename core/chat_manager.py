@@ -1,12 +1,304 @@
 import sqlite3
+import asyncio
+import functools
 import json
+import math
+import re
+import threading
+import queue
+import time
+import atexit
+import hashlib
+import itertools
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Iterable, Optional, Tuple, Callable
+
+try:
+    from core.learning_index import LearningIndex
+except ImportError:
+    from learning_index import LearningIndex
+
+class ConnectionPool:
+    """Thread-aware pool of long-lived SQLite connections, kept per database file"""
+    
+    def __init__(self, max_idle: int = 4, busy_timeout: float = 30.0):
+        self.max_idle = max_idle
+        self.busy_timeout = busy_timeout
+        self._idle: Dict[str, List[sqlite3.Connection]] = {}
+        self._lock = threading.Lock()
+    
+    def _connect(self, db_key: str) -> sqlite3.Connection:
+        """Open and configure a new connection"""
+        # A connection is only ever used by the thread that checked it out,
+        # so it may safely move between threads across checkouts
+        conn = sqlite3.connect(db_key, timeout=self.busy_timeout, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+    
+    @contextmanager
+    def connection(self, db_path: Path) -> Iterator[sqlite3.Connection]:
+        """Check out a connection, committing on success and rolling back on error"""
+        db_key = str(Path(db_path).resolve())
+        
+        with self._lock:
+            idle = self._idle.get(db_key)
+            conn = idle.pop() if idle else None
+        
+        if conn is None:
+            conn = self._connect(db_key)
+        
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._release(db_key, conn)
+    
+    def _release(self, db_key: str, conn: sqlite3.Connection):
+        """Return a connection to the pool, closing it if the pool is full"""
+        with self._lock:
+            idle = self._idle.setdefault(db_key, [])
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+    
+    def close_all(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+class WriteBehindWriter:
+    """Background thread that commits queued writes in coalesced batches"""
+    
+    # Seconds to wait before each retry of a failed commit, e.g. on a locked database
+    RETRY_DELAYS = (0.05, 0.25, 1.0)
+    
+    def __init__(self, max_queue_size: int = 1000, max_batch_size: int = 200):
+        self.max_batch_size = max_batch_size
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._pending = 0
+        self._pending_changed = threading.Condition()
+        self._metrics = {
+            'batches_committed': 0,
+            'writes_committed': 0,
+            'writes_failed': 0,
+            'retries': 0,
+            'max_queue_depth': 0,
+            'last_commit_ms': 0.0,
+            'max_commit_ms': 0.0,
+            'total_commit_ms': 0.0,
+            'last_error': None
+        }
+        self._metrics_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="chat-write-behind", daemon=True)
+        self._thread.start()
+    
+    def submit(self, chat_manager: 'ChatManager', module_name: str, kind: str, rows: List[Tuple]):
+        """Queue rows for a module, blocking while the queue is full"""
+        with self._pending_changed:
+            self._pending += 1
+        
+        self._queue.put((chat_manager, module_name, kind, rows))
+        
+        depth = self._queue.qsize()
+        with self._metrics_lock:
+            if depth > self._metrics['max_queue_depth']:
+                self._metrics['max_queue_depth'] = depth
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued write is committed; False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        with self._pending_changed:
+            while self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._pending_changed.wait(remaining)
+        
+        return True
+    
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """Flush outstanding writes and stop the writer thread"""
+        flushed = self.flush(timeout)
+        self._queue.put(None)
+        self._thread.join(timeout)
+        return flushed
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get queue depth and commit latency metrics"""
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        
+        batches = metrics['batches_committed']
+        metrics['queue_depth'] = self._queue.qsize()
+        metrics['avg_commit_ms'] = metrics['total_commit_ms'] / batches if batches else 0.0
+        return metrics
+    
+    def _run(self):
+        """Drain the queue, committing whatever has accumulated as one batch"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            
+            batch = [item]
+            stop = False
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            
+            self._commit(batch)
+            
+            with self._pending_changed:
+                self._pending -= len(batch)
+                self._pending_changed.notify_all()
+            
+            if stop:
+                return
+    
+    def _commit(self, batch: List[Tuple]):
+        """Write a batch with one transaction per module database"""
+        groups = {}
+        for chat_manager, module_name, kind, rows in batch:
+            db_key = chat_manager._db_key(module_name)
+            group = groups.setdefault(db_key, (chat_manager, module_name, []))
+            group[2].append((kind, rows))
+        
+        for chat_manager, module_name, writes in groups.values():
+            started = time.perf_counter()
+            committed = len(writes)
+            error = self._commit_writes(chat_manager, module_name, writes, self.RETRY_DELAYS)
+            
+            if error is not None:
+                # Commit the writes one by one so a single bad write cannot drop the rest
+                print(f"Error writing batch for module {module_name}, writing items separately: {error}")
+                failed = 0
+                for write in writes:
+                    item_error = self._commit_writes(chat_manager, module_name, [write], self.RETRY_DELAYS[:1])
+                    if item_error is not None:
+                        print(f"Error writing {write[0]} rows for module {module_name}: {item_error}")
+                        failed += 1
+                        error = item_error
+                
+                with self._metrics_lock:
+                    self._metrics['writes_failed'] += failed
+                    self._metrics['last_error'] = str(error)
+                committed -= failed
+                if not committed:
+                    continue
+            
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._metrics_lock:
+                self._metrics['batches_committed'] += 1
+                self._metrics['writes_committed'] += committed
+                self._metrics['last_commit_ms'] = elapsed_ms
+                self._metrics['total_commit_ms'] += elapsed_ms
+                self._metrics['max_commit_ms'] = max(self._metrics['max_commit_ms'], elapsed_ms)
+    
+    def _commit_writes(self, chat_manager: 'ChatManager', module_name: str, writes: List[Tuple],
+                       retry_delays: Tuple[float, ...]) -> Optional[Exception]:
+        """Commit writes in one transaction, retrying after each delay; returns the last error if all attempts fail"""
+        for attempt in range(len(retry_delays) + 1):
+            if attempt:
+                time.sleep(retry_delays[attempt - 1])
+                with self._metrics_lock:
+                    self._metrics['retries'] += 1
+            
+            try:
+                chat_manager._commit_writes(module_name, writes)
+                return None
+            except Exception as e:
+                error = e
+        
+        return error
 
 class ChatManager:
     """Manages chat conversations and learning data"""
     
+    # Shared by every ChatManager in the process
+    _pool = ConnectionPool()
+    _initialized_databases = set()
+    _init_lock = threading.Lock()
+    
+    # Learning indexes by database, built on first use; each database's commit
+    # lock keeps its commits and index updates in the same order
+    _learning_indexes: Dict[str, LearningIndex] = {}
+    _commit_locks: Dict[str, threading.RLock] = {}
+    _commit_locks_lock = threading.Lock()
+    
+    # Databases whose learning writes maintain the BM25 index
+    _bm25_databases = set()
+    
+    # Set while write-behind mode is enabled
+    _writer: Optional[WriteBehindWriter] = None
+    _writer_lock = threading.Lock()
+    
+    # Threads running blocking database calls for the async API, created on first use;
+    # bounded so any number of awaiting conversations share them
+    ASYNC_WORKERS = 8
+    _async_executor: Optional[ThreadPoolExecutor] = None
+    _async_lock = threading.Lock()
+    
+    # Connections of transactions opened by ChatManager.transaction in the current context, by database
+    _transactions: ContextVar[Optional[Dict[str, sqlite3.Connection]]] = ContextVar('chat_transactions', default=None)
+    
+    # Schema migrations, applied in order and tracked with PRAGMA user_version
+    SCHEMA_MIGRATIONS = (
+        '_migrate_unique_patterns',
+        '_migrate_stat_counters',
+        '_migrate_learning_concepts',
+        '_migrate_learning_score_index',
+        '_migrate_bm25_index',
+        '_migrate_normalized_responses',
+        '_migrate_response_cleanup',
+        '_migrate_learning_version',
+    )
+    
+    # Migrations that free enough space to be worth a VACUUM afterwards
+    VACUUM_AFTER_MIGRATIONS = {'_migrate_normalized_responses'}
+    
+    # Counters kept in module_stats and the tables they count
+    COUNTED_TABLES = {
+        'learned_responses': 'learning_data',
+        'total_conversations': 'conversations',
+    }
+    
+    # Deletes stored responses no learning pattern refers to
+    PRUNE_RESPONSES_SQL = '''
+        DELETE FROM responses
+        WHERE NOT EXISTS (SELECT 1 FROM learning_data WHERE learning_data.response_id = responses.id)
+    '''
+    
+    # Confidence and usage part of a learned response's score; must match the
+    # indexed expression exactly for SQLite to use the index
+    BASE_SCORE_SQL = 'confidence * 2 + MIN(usage_count * 0.5, 3)'
+    
+    # Splits patterns and queries into BM25 terms
+    BM25_TERM_PATTERN = re.compile(r'\w+')
+    
+    # Patterns processed per transaction when backfilling concepts
+    CONCEPT_INDEX_CHUNK = 500
+    
     def __init__(self):
         self.data_dir = Path("data")
         self.data_dir.mkdir(exist_ok=True)
@@ -15,13 +307,299 @@ class ChatManager:
         """Get database path for a specific module"""
         return self.data_dir / f"{module_name}_chat.db"
     
+    def connection(self, module_name: str):
+        """Get a pooled connection context for a module's database"""
+        return self._pool.connection(self.get_module_db_path(module_name))
+    
+    def _transaction_connection(self, module_name: str) -> Optional[sqlite3.Connection]:
+        """Get the connection of this context's open transaction on a module's database, if any"""
+        transactions = self._transactions.get()
+        if not transactions:
+            return None
+        return transactions.get(self._db_key(module_name))
+    
+    def _read_connection(self, module_name: str):
+        """Get a connection context for reads, inside the current transaction if there is one"""
+        conn = self._transaction_connection(module_name)
+        if conn is not None:
+            return nullcontext(conn)
+        return self.connection(module_name)
+    
+    @contextmanager
+    def transaction(self, module_name: str) -> Iterator[sqlite3.Connection]:
+        """Run this context's reads and writes of a module's database in one transaction, committed at exit"""
+        db_key = self._db_key(module_name)
+        transactions = self._transactions.get() or {}
+        if db_key in transactions:
+            yield transactions[db_key]
+            return
+        
+        self.init_module_database(module_name)
+        
+        # Writes update the learning index as they are made, so other threads'
+        # commits to this database wait until this transaction ends
+        with self._commit_lock(module_name):
+            try:
+                with self.connection(module_name) as conn:
+                    conn.execute('BEGIN IMMEDIATE')
+                    token = self._transactions.set({**transactions, db_key: conn})
+                    try:
+                        yield conn
+                    finally:
+                        self._transactions.reset(token)
+            except BaseException:
+                # The learning index already holds the rolled back writes
+                self.release_learning_index(module_name)
+                raise
+    
+    @classmethod
+    def close_connections(cls):
+        """Close all pooled database connections"""
+        cls._pool.close_all()
+    
+    @classmethod
+    def enable_write_behind(cls, max_queue_size: int = 1000, max_batch_size: int = 200):
+        """Persist conversations and learning data from a background writer thread"""
+        with cls._writer_lock:
+            if cls._writer is None:
+                cls._writer = WriteBehindWriter(max_queue_size, max_batch_size)
+                atexit.register(cls.disable_write_behind)
+    
+    @classmethod
+    def disable_write_behind(cls, timeout: Optional[float] = None) -> bool:
+        """Flush pending writes and return to synchronous persistence"""
+        with cls._writer_lock:
+            writer, cls._writer = cls._writer, None
+        
+        if writer is None:
+            return True
+        return writer.stop(timeout)
+    
+    @classmethod
+    def flush(cls, timeout: Optional[float] = None) -> bool:
+        """Wait until queued writes are committed; False on timeout"""
+        writer = cls._writer
+        if writer is None:
+            return True
+        return writer.flush(timeout)
+    
+    @classmethod
+    def get_write_metrics(cls) -> Dict[str, Any]:
+        """Get write-behind queue depth and commit latency metrics"""
+        writer = cls._writer
+        if writer is None:
+            return {'enabled': False}
+        
+        metrics = writer.get_metrics()
+        metrics['enabled'] = True
+        return metrics
+    
+    def _write(self, module_name: str, kind: str, rows: List[Tuple]):
+        """Persist rows now, or queue them when write-behind is enabled"""
+        # Inside a transaction, later reads of the transaction see the rows
+        conn = self._transaction_connection(module_name)
+        if conn is not None:
+            self._run_writes(conn, module_name, [(kind, rows)])
+            return
+        
+        writer = self._writer
+        if writer is not None:
+            writer.submit(self, module_name, kind, rows)
+            return
+        
+        self._commit_writes(module_name, [(kind, rows)])
+    
+    def _commit_writes(self, module_name: str, writes: List[Tuple[str, List[Tuple]]]):
+        """Commit (kind, rows) writes in one transaction"""
+        self.init_module_database(module_name)
+        
+        with self._commit_lock(module_name):
+            try:
+                with self.connection(module_name) as conn:
+                    self._run_writes(conn, module_name, writes)
+            except BaseException:
+                # The learning index may already hold the rolled back writes
+                self.release_learning_index(module_name)
+                raise
+    
+    def _run_writes(self, conn: sqlite3.Connection, module_name: str, writes: List[Tuple[str, List[Tuple]]]):
+        """Run (kind, rows) writes in conn's transaction, keeping the learning index in step"""
+        learning = [rows for kind, rows in writes if kind == 'learning']
+        if learning:
+            # Hold the write lock from the first version read, so no other commit lands in between
+            if not conn.in_transaction:
+                conn.execute('BEGIN IMMEDIATE')
+            version = self._learning_version(conn)
+        
+        for kind, rows in writes:
+            self.WRITERS[kind](self, conn, module_name, rows)
+        
+        if learning:
+            self._update_learning_index(module_name, learning, version, self._learning_version(conn))
+    
+    def _update_learning_index(self, module_name: str, learning: List[List[Tuple]], version: int, new_version: int):
+        """Apply learning rows written between two learning versions to the module's index"""
+        db_key = self._db_key(module_name)
+        index = self._learning_indexes.get(db_key)
+        if index is None:
+            return
+        
+        if index.version != version:
+            # Another connection changed learning data since the index was built
+            self._learning_indexes.pop(db_key, None)
+            return
+        
+        for rows in learning:
+            index.apply_upserts(rows)
+        index.version = new_version
+    
+    @staticmethod
+    def _learning_version(conn: sqlite3.Connection) -> int:
+        """Get the database's learning version, bumped by every change to learning_data"""
+        row = conn.execute(
+            "SELECT CAST(value AS INTEGER) FROM module_stats WHERE key = 'learning_version'"
+        ).fetchone()
+        return row[0] if row else 0
+    
+    def _commit_lock(self, module_name: str) -> threading.RLock:
+        """Get the lock serializing this process's commits to a module's database"""
+        db_key = self._db_key(module_name)
+        lock = self._commit_locks.get(db_key)
+        if lock is None:
+            with self._commit_locks_lock:
+                lock = self._commit_locks.setdefault(db_key, threading.RLock())
+        return lock
+    
+    def _db_key(self, module_name: str) -> str:
+        """Get the process-wide key of a module's database"""
+        return str(self.get_module_db_path(module_name).resolve())
+    
+    def get_learning_index(self, module_name: str) -> LearningIndex:
+        """Get the module's in-memory learning index, rebuilding it after commits from other processes"""
+        db_key = self._db_key(module_name)
+        self.init_module_database(module_name)
+        
+        index = self._learning_indexes.get(db_key)
+        if index is not None:
+            with self._read_connection(module_name) as conn:
+                version = self._learning_version(conn)
+            # An index ahead of the committed version holds an open transaction's writes
+            if version <= index.version:
+                return index
+        
+        with self._commit_lock(module_name):
+            with self._read_connection(module_name) as conn:
+                version = self._learning_version(conn)
+                index = self._learning_indexes.get(db_key)
+                if index is not None and version <= index.version:
+                    return index
+                
+                # Read after the version, so the rows are never older than it
+                rows = conn.execute('''
+                    SELECT learning_data.id, pattern, response, confidence, usage_count
+                    FROM learning_data JOIN responses ON responses.id = learning_data.response_id
+                ''').fetchall()
+            
+            index = LearningIndex(rows, version)
+            self._learning_indexes[db_key] = index
+        
+        return index
+    
+    def release_learning_index(self, module_name: str) -> bool:
+        """Drop the module's in-memory learning index; the next use rebuilds it"""
+        with self._commit_lock(module_name):
+            return self._learning_indexes.pop(self._db_key(module_name), None) is not None
+    
+    @classmethod
+    def get_learning_index_metrics(cls) -> Dict[str, int]:
+        """Get the number of in-memory learning indexes and the patterns they hold"""
+        indexes = list(cls._learning_indexes.values())
+        return {
+            'indexes': len(indexes),
+            'indexed_patterns': sum(len(index) for index in indexes)
+        }
+    
     def init_module_database(self, module_name: str):
-        """Initialize database for a module"""
-        db_path = self.get_module_db_path(module_name)
+        """Initialize database for a module (once per process)"""
+        db_key = self._db_key(module_name)
+        if db_key in self._initialized_databases:
+            return
+        
+        with self._init_lock:
+            if db_key in self._initialized_databases:
+                return
+            
+            with self.connection(module_name) as conn:
+                # Hold the write lock so concurrent processes migrate one at a time
+                conn.execute('BEGIN IMMEDIATE')
+                self._create_schema(conn.cursor())
+                applied = self._apply_migrations(conn)
+                
+                bm25_enabled = conn.execute(
+                    "SELECT 1 FROM module_stats WHERE key = 'bm25_documents'"
+                ).fetchone()
+            
+            if self.VACUUM_AFTER_MIGRATIONS.intersection(applied):
+                with self.connection(module_name) as conn:
+                    conn.execute('VACUUM')
+            
+            if bm25_enabled:
+                self._bm25_databases.add(db_key)
+            self._initialized_databases.add(db_key)
+    
+    def _apply_migrations(self, conn: sqlite3.Connection) -> List[str]:
+        """Bring a module database up to the current schema version; returns the applied migrations"""
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        applied = []
+        
+        for target in range(version + 1, len(self.SCHEMA_MIGRATIONS) + 1):
+            name = self.SCHEMA_MIGRATIONS[target - 1]
+            getattr(self, name)(conn.cursor())
+            conn.execute(f'PRAGMA user_version = {target}')
+            applied.append(name)
+        
+        return applied
+    
+    def _migrate_unique_patterns(self, cursor: sqlite3.Cursor):
+        """Merge duplicate learning patterns and make pattern unique"""
+        # Older code kept updating the first row of a pattern, so that row
+        # survives; every extra copy counts as one more use
+        cursor.execute('''
+            UPDATE learning_data
+            SET usage_count = (
+                    SELECT SUM(usage_count) + COUNT(*) - 1
+                    FROM learning_data AS duplicate
+                    WHERE duplicate.pattern = learning_data.pattern
+                ),
+                last_used = (
+                    SELECT MAX(last_used)
+                    FROM learning_data AS duplicate
+                    WHERE duplicate.pattern = learning_data.pattern
+                )
+            WHERE id IN (
+                SELECT MIN(id) FROM learning_data
+                GROUP BY pattern HAVING COUNT(*) > 1
+            )
+        ''')
+        
+        cursor.execute('''
+            DELETE FROM learning_data
+            WHERE id NOT IN (SELECT MIN(id) FROM learning_data GROUP BY pattern)
+        ''')
         
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_learning_data_pattern
+            ON learning_data (pattern)
+        ''')
         
+        cursor.execute('''
+            UPDATE module_stats
+            SET value = (SELECT COUNT(*) FROM learning_data), updated_at = CURRENT_TIMESTAMP
+            WHERE key = 'learned_responses'
+        ''')
+    
+    def _create_schema(self, cursor: sqlite3.Cursor):
+        """Create the module tables"""
         # Create conversations table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS conversations (
@@ -53,35 +631,242 @@ class ChatManager:
                 updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+    
+    def _migrate_stat_counters(self, cursor: sqlite3.Cursor):
+        """Maintain module_stats counters with triggers instead of COUNT(*) per write"""
+        for key, table in self.COUNTED_TABLES.items():
+            for event, delta in (('INSERT', '+ 1'), ('DELETE', '- 1')):
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_count
+                    AFTER {event} ON {table}
+                    BEGIN
+                        INSERT INTO module_stats (key, value, updated_at)
+                        VALUES ('{key}', 0 {delta}, CURRENT_TIMESTAMP)
+                        ON CONFLICT (key) DO UPDATE
+                        SET value = CAST(value AS INTEGER) {delta}, updated_at = CURRENT_TIMESTAMP;
+                    END
+                ''')
         
-        conn.commit()
-        conn.close()
+        self._reconcile_stats(cursor)
     
-    def save_conversation(self, module_name: str, user_input: str, ai_response: str, context: List[Dict] = None):
-        """Save a conversation to the module's database"""
-        self.init_module_database(module_name)
+    def _migrate_learning_concepts(self, cursor: sqlite3.Cursor):
+        """Store concepts extracted from learning patterns at learn time"""
+        cursor.execute('''
+            ALTER TABLE learning_data ADD COLUMN concepts_indexed INTEGER DEFAULT 0
+        ''')
         
-        db_path = self.get_module_db_path(module_name)
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS learning_concepts (
+                concept TEXT NOT NULL,
+                pattern_id INTEGER NOT NULL,
+                PRIMARY KEY (concept, pattern_id)
+            ) WITHOUT ROWID
+        ''')
         
-        context_json = json.dumps(context) if context else None
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_learning_concepts_pattern
+            ON learning_concepts (pattern_id)
+        ''')
         
         cursor.execute('''
-            INSERT INTO conversations (user_input, ai_response, context)
-            VALUES (?, ?, ?)
-        ''', (user_input, ai_response, context_json))
+            CREATE TRIGGER IF NOT EXISTS trg_learning_data_delete_concepts
+            AFTER DELETE ON learning_data
+            BEGIN
+                DELETE FROM learning_concepts WHERE pattern_id = OLD.id;
+            END
+        ''')
+    
+    def _migrate_learning_score_index(self, cursor: sqlite3.Cursor):
+        """Index the concept-independent part of the learned response score"""
+        cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_learning_data_base_score
+            ON learning_data (({self.BASE_SCORE_SQL}))
+        ''')
+    
+    def _migrate_bm25_index(self, cursor: sqlite3.Cursor):
+        """Add tables for the opt-in BM25 index over learning patterns"""
+        # bm25_length stays NULL until a pattern is indexed
+        cursor.execute('''
+            ALTER TABLE learning_data ADD COLUMN bm25_length INTEGER
+        ''')
         
-        # Update conversation count
         cursor.execute('''
-            INSERT OR REPLACE INTO module_stats (key, value, updated_at)
-            VALUES ('total_conversations', 
-                    COALESCE((SELECT CAST(value AS INTEGER) FROM module_stats WHERE key = 'total_conversations'), 0) + 1,
-                    CURRENT_TIMESTAMP)
+            CREATE TABLE IF NOT EXISTS bm25_postings (
+                term TEXT NOT NULL,
+                pattern_id INTEGER NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, pattern_id)
+            ) WITHOUT ROWID
         ''')
         
-        conn.commit()
-        conn.close()
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_bm25_postings_pattern
+            ON bm25_postings (pattern_id)
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS bm25_terms (
+                term TEXT PRIMARY KEY,
+                df INTEGER NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_learning_data_delete_bm25
+            AFTER DELETE ON learning_data
+            WHEN OLD.bm25_length IS NOT NULL
+            BEGIN
+                UPDATE bm25_terms SET df = df - 1
+                WHERE term IN (SELECT term FROM bm25_postings WHERE pattern_id = OLD.id);
+                DELETE FROM bm25_postings WHERE pattern_id = OLD.id;
+                UPDATE module_stats SET value = CAST(value AS INTEGER) - 1
+                WHERE key = 'bm25_documents';
+                UPDATE module_stats SET value = CAST(value AS INTEGER) - OLD.bm25_length
+                WHERE key = 'bm25_total_length';
+            END
+        ''')
+    
+    def _migrate_normalized_responses(self, cursor: sqlite3.Cursor):
+        """Store each distinct response once and reference it from learning patterns"""
+        cursor.connection.create_function('response_hash', 1, self.response_hash, deterministic=True)
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                id INTEGER PRIMARY KEY,
+                content_hash BLOB NOT NULL UNIQUE,
+                response TEXT NOT NULL
+            )
+        ''')
+        
+        cursor.execute('''
+            INSERT OR IGNORE INTO responses (content_hash, response)
+            SELECT response_hash(response), response FROM learning_data
+        ''')
+        
+        # Rebuild learning_data around a response reference, then recreate
+        # its indexes and triggers from their stored definitions
+        dependents = [row[0] for row in cursor.execute('''
+            SELECT sql FROM sqlite_master
+            WHERE tbl_name = 'learning_data' AND type IN ('index', 'trigger') AND sql IS NOT NULL
+        ''').fetchall()]
+        
+        cursor.execute('''
+            CREATE TABLE learning_data_normalized (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                pattern TEXT NOT NULL,
+                response_id INTEGER NOT NULL REFERENCES responses (id),
+                confidence REAL DEFAULT 1.0,
+                usage_count INTEGER DEFAULT 0,
+                last_used DATETIME DEFAULT CURRENT_TIMESTAMP,
+                concepts_indexed INTEGER DEFAULT 0,
+                bm25_length INTEGER
+            )
+        ''')
+        
+        cursor.execute('''
+            INSERT INTO learning_data_normalized
+                (id, pattern, response_id, confidence, usage_count, last_used, concepts_indexed, bm25_length)
+            SELECT learning_data.id, pattern, responses.id, confidence, usage_count, last_used,
+                   concepts_indexed, bm25_length
+            FROM learning_data
+            JOIN responses ON responses.content_hash = response_hash(learning_data.response)
+        ''')
+        
+        cursor.execute('DROP TABLE learning_data')
+        cursor.execute('ALTER TABLE learning_data_normalized RENAME TO learning_data')
+        
+        for sql in dependents:
+            cursor.execute(sql)
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_learning_data_response
+            ON learning_data (response_id)
+        ''')
+    
+    def _migrate_response_cleanup(self, cursor: sqlite3.Cursor):
+        """Delete stored responses as soon as no learning pattern refers to them"""
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_learning_data_update_response
+            AFTER UPDATE OF response_id ON learning_data
+            WHEN OLD.response_id != NEW.response_id
+            BEGIN
+                DELETE FROM responses
+                WHERE id = OLD.response_id
+                  AND NOT EXISTS (SELECT 1 FROM learning_data WHERE response_id = OLD.response_id);
+            END
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_learning_data_delete_response
+            AFTER DELETE ON learning_data
+            BEGIN
+                DELETE FROM responses
+                WHERE id = OLD.response_id
+                  AND NOT EXISTS (SELECT 1 FROM learning_data WHERE response_id = OLD.response_id);
+            END
+        ''')
+        
+        # Responses orphaned before the triggers existed
+        cursor.execute(self.PRUNE_RESPONSES_SQL)
+    
+    def _migrate_learning_version(self, cursor: sqlite3.Cursor):
+        """Count changes to learning_data, so in-memory indexes notice other processes' commits"""
+        cursor.execute('''
+            INSERT OR IGNORE INTO module_stats (key, value) VALUES ('learning_version', 0)
+        ''')
+        
+        for event in ('INSERT', 'DELETE', 'UPDATE OF pattern, response_id, confidence, usage_count'):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_learning_data_{event.split()[0].lower()}_version
+                AFTER {event} ON learning_data
+                BEGIN
+                    UPDATE module_stats
+                    SET value = CAST(value AS INTEGER) + 1, updated_at = CURRENT_TIMESTAMP
+                    WHERE key = 'learning_version';
+                END
+            ''')
+    
+    @staticmethod
+    def response_hash(response: str) -> bytes:
+        """Get the content hash responses are deduplicated by"""
+        return hashlib.sha1(response.encode('utf-8')).digest()
+    
+    def prune_responses(self, module_name: str) -> int:
+        """Delete stored responses no learning pattern refers to; returns the count"""
+        self.init_module_database(module_name)
+        
+        with self.connection(module_name) as conn:
+            return conn.execute(self.PRUNE_RESPONSES_SQL).rowcount
+    
+    def _reconcile_stats(self, cursor: sqlite3.Cursor):
+        """Recompute the module_stats counters from their tables"""
+        for key, table in self.COUNTED_TABLES.items():
+            cursor.execute(f'''
+                INSERT OR REPLACE INTO module_stats (key, value, updated_at)
+                VALUES ('{key}', (SELECT COUNT(*) FROM {table}), CURRENT_TIMESTAMP)
+            ''')
+    
+    def reconcile_module_stats(self, module_name: str) -> Dict[str, Any]:
+        """Recompute exact statistics for a module and return them"""
+        self.init_module_database(module_name)
+        
+        with self.connection(module_name) as conn:
+            self._reconcile_stats(conn.cursor())
+        
+        return self.get_module_stats(module_name)
+    
+    def save_conversation(self, module_name: str, user_input: str, ai_response: str, context: List[Dict] = None):
+        """Save a conversation to the module's database"""
+        context_json = json.dumps(context) if context else None
+        self._write(module_name, 'conversations', [(user_input, ai_response, context_json)])
+    
+    def _insert_conversations(self, conn: sqlite3.Connection, module_name: str, rows: List[Tuple]):
+        """Insert conversation rows"""
+        # total_conversations is kept up to date by a trigger
+        conn.executemany('''
+            INSERT INTO conversations (user_input, ai_response, context)
+            VALUES (?, ?, ?)
+        ''', rows)
     
     def get_conversations(self, module_name: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent conversations for a module"""
@@ -90,18 +875,18 @@ class ChatManager:
         if not db_path.exists():
             return []
         
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT user_input, ai_response, timestamp, context
-            FROM conversations
-            ORDER BY timestamp DESC
-            LIMIT ?
-        ''', (limit,))
+        with self._read_connection(module_name) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT user_input, ai_response, timestamp, context
+                FROM conversations
+                ORDER BY timestamp DESC
+                LIMIT ?
+            ''', (limit,))
+            rows = cursor.fetchall()
         
         conversations = []
-        for row in cursor.fetchall():
+        for row in rows:
             context = json.loads(row[3]) if row[3] else None
             conversations.append({
                 'user_input': row[0],
@@ -110,74 +895,356 @@ class ChatManager:
                 'context': context
             })
         
-        conn.close()
         return conversations
     
     def save_learning_data(self, module_name: str, pattern: str, response: str, confidence: float = 1.0):
         """Save learning data for a module"""
+        self.save_learning_batch(module_name, [pattern], response, confidence)
+    
+    def save_learning_batch(self, module_name: str, patterns: List[str], response: str, confidence: float = 1.0,
+                            concepts: Optional[List[List[str]]] = None):
+        """Save many learning patterns for one response in a single transaction"""
+        if not patterns:
+            return
+        
+        # Concepts of each pattern are stored the first time it is learned
+        if concepts is None:
+            concepts = [None] * len(patterns)
+        
+        self.save_learning_rows(module_name, [
+            (pattern, response, confidence, pattern_concepts)
+            for pattern, pattern_concepts in zip(patterns, concepts)
+        ])
+    
+    def save_learning_rows(self, module_name: str, rows: List[Tuple]):
+        """Save (pattern, response, confidence, concepts) rows in a single transaction"""
+        if rows:
+            self._write(module_name, 'learning', rows)
+    
+    def _upsert_learning(self, conn: sqlite3.Connection, module_name: str, rows: List[Tuple]):
+        """Insert or update learning rows"""
+        # Each distinct response is stored once. Rows are upserted in order, in runs
+        # sharing a response looked up just before the run: re-pointing a pattern
+        # deletes its old response once unused, and a later run may learn it again
+        for response, run in itertools.groupby(rows, key=lambda row: row[1]):
+            content_hash = self.response_hash(response)
+            conn.execute('''
+                INSERT OR IGNORE INTO responses (content_hash, response) VALUES (?, ?)
+            ''', (content_hash, response))
+            response_id = conn.execute(
+                'SELECT id FROM responses WHERE content_hash = ?', (content_hash,)
+            ).fetchone()[0]
+            
+            # learned_responses is kept up to date by a trigger;
+            # a repeated pattern counts as another use
+            conn.executemany('''
+                INSERT INTO learning_data (pattern, response_id, confidence)
+                VALUES (?, ?, ?)
+                ON CONFLICT (pattern) DO UPDATE
+                SET response_id = excluded.response_id,
+                    confidence = excluded.confidence,
+                    usage_count = usage_count + 1,
+                    last_used = CURRENT_TIMESTAMP
+            ''', [(row[0], response_id, row[2]) for row in run])
+        
+        self._store_concepts(conn, [(row[0], row[3]) for row in rows if row[3] is not None])
+        
+        if self._db_key(module_name) in self._bm25_databases:
+            self._index_bm25_patterns(conn, [row[0] for row in rows])
+    
+    def _store_concepts(self, conn: sqlite3.Connection, pattern_concepts: List[Tuple[str, List[str]]]):
+        """Store concepts for patterns that do not have them yet"""
+        conn.executemany('''
+            INSERT OR IGNORE INTO learning_concepts (concept, pattern_id)
+            SELECT ?, id FROM learning_data
+            WHERE pattern = ? AND concepts_indexed = 0
+        ''', [
+            (concept, pattern)
+            for pattern, concepts in pattern_concepts
+            for concept in concepts
+        ])
+        
+        conn.executemany('''
+            UPDATE learning_data SET concepts_indexed = 1
+            WHERE pattern = ? AND concepts_indexed = 0
+        ''', [(pattern,) for pattern, _ in pattern_concepts])
+    
+    def index_learning_concepts(self, module_name: str, extract_concepts: Callable[[str], List[str]]) -> int:
+        """Extract and store concepts for learned patterns that have none; returns the count"""
+        self.init_module_database(module_name)
+        indexed = 0
+        
+        while True:
+            with self._commit_lock(module_name):
+                with self.connection(module_name) as conn:
+                    patterns = [row[0] for row in conn.execute(
+                        'SELECT pattern FROM learning_data WHERE concepts_indexed = 0 LIMIT ?',
+                        (self.CONCEPT_INDEX_CHUNK,)
+                    )]
+                    self._store_concepts(conn, [(pattern, extract_concepts(pattern)) for pattern in patterns])
+            
+            indexed += len(patterns)
+            if len(patterns) < self.CONCEPT_INDEX_CHUNK:
+                return indexed
+    
+    @classmethod
+    def bm25_terms(cls, text: str) -> List[str]:
+        """Split text into BM25 terms"""
+        return cls.BM25_TERM_PATTERN.findall(text.lower())
+    
+    def _index_bm25_patterns(self, conn: sqlite3.Connection, patterns: Iterable[str]):
+        """Add patterns that are not indexed yet to the BM25 index"""
+        documents = []
+        for pattern in dict.fromkeys(patterns):
+            row = conn.execute(
+                'SELECT id FROM learning_data WHERE pattern = ? AND bm25_length IS NULL', (pattern,)
+            ).fetchone()
+            if row:
+                documents.append((row[0], Counter(self.bm25_terms(pattern))))
+        
+        if not documents:
+            return
+        
+        document_frequencies = Counter()
+        for _, term_counts in documents:
+            document_frequencies.update(term_counts.keys())
+        
+        conn.executemany('''
+            INSERT INTO bm25_postings (term, pattern_id, tf) VALUES (?, ?, ?)
+        ''', [
+            (term, pattern_id, tf)
+            for pattern_id, term_counts in documents
+            for term, tf in term_counts.items()
+        ])
+        
+        conn.executemany('''
+            INSERT INTO bm25_terms (term, df) VALUES (?, ?)
+            ON CONFLICT (term) DO UPDATE SET df = df + excluded.df
+        ''', list(document_frequencies.items()))
+        
+        conn.executemany('''
+            UPDATE learning_data SET bm25_length = ? WHERE id = ?
+        ''', [(sum(term_counts.values()), pattern_id) for pattern_id, term_counts in documents])
+        
+        total_length = sum(sum(term_counts.values()) for _, term_counts in documents)
+        for key, delta in (('bm25_documents', len(documents)), ('bm25_total_length', total_length)):
+            conn.execute('''
+                UPDATE module_stats SET value = CAST(value AS INTEGER) + ?, updated_at = CURRENT_TIMESTAMP
+                WHERE key = ?
+            ''', (delta, key))
+    
+    def enable_bm25_index(self, module_name: str) -> int:
+        """Maintain a BM25 index for a module, indexing existing patterns; returns the count"""
         self.init_module_database(module_name)
+        db_key = self._db_key(module_name)
+        indexed = 0
+        
+        with self._commit_lock(module_name):
+            with self.connection(module_name) as conn:
+                conn.executemany('''
+                    INSERT OR IGNORE INTO module_stats (key, value) VALUES (?, 0)
+                ''', [('bm25_documents',), ('bm25_total_length',)])
+            self._bm25_databases.add(db_key)
+            
+            while True:
+                with self.connection(module_name) as conn:
+                    patterns = [row[0] for row in conn.execute(
+                        'SELECT pattern FROM learning_data WHERE bm25_length IS NULL LIMIT ?',
+                        (self.CONCEPT_INDEX_CHUNK,)
+                    )]
+                    self._index_bm25_patterns(conn, patterns)
+                
+                indexed += len(patterns)
+                if len(patterns) < self.CONCEPT_INDEX_CHUNK:
+                    return indexed
+    
+    def search_bm25(self, module_name: str, query: str, k1: float = 1.2, b: float = 0.75, limit: int = 5,
+                    max_postings: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the learned patterns best matching query by BM25 score, best first"""
+        terms = list(dict.fromkeys(self.bm25_terms(query)))
+        db_path = self.get_module_db_path(module_name)
+        
+        if not terms or not db_path.exists():
+            return []
+        
+        with self._read_connection(module_name) as conn:
+            stats = dict(conn.execute('''
+                SELECT key, CAST(value AS INTEGER) FROM module_stats
+                WHERE key IN ('bm25_documents', 'bm25_total_length')
+            ''').fetchall())
+            documents = stats.get('bm25_documents', 0)
+            if not documents:
+                return []
+            average_length = stats.get('bm25_total_length', 0) / documents or 1
+            
+            placeholders = ", ".join("?" for _ in terms)
+            frequencies = conn.execute(
+                f'SELECT term, df FROM bm25_terms WHERE term IN ({placeholders}) AND df > 0', terms
+            ).fetchall()
+            
+            # Very common terms carry little weight; skipping them bounds the
+            # postings read per query on large stores
+            if max_postings is not None:
+                frequencies = [(term, df) for term, df in frequencies if df <= max_postings]
+            if not frequencies:
+                return []
+            
+            weights = [
+                (term, math.log(1 + (documents - df + 0.5) / (df + 0.5)))
+                for term, df in frequencies
+            ]
+            
+            placeholders = ", ".join("(?, ?)" for _ in weights)
+            rows = conn.execute(f'''
+                WITH query_terms (term, idf) AS (VALUES {placeholders})
+                SELECT learning_data.pattern, responses.response, learning_data.confidence,
+                       learning_data.usage_count,
+                       SUM(query_terms.idf * bm25_postings.tf * (? + 1)
+                           / (bm25_postings.tf + ? * (1 - ? + ? * learning_data.bm25_length / ?))) AS score
+                FROM query_terms
+                JOIN bm25_postings USING (term)
+                JOIN learning_data ON learning_data.id = bm25_postings.pattern_id
+                JOIN responses ON responses.id = learning_data.response_id
+                GROUP BY bm25_postings.pattern_id
+                ORDER BY score DESC, learning_data.confidence DESC, learning_data.usage_count DESC, learning_data.id
+                LIMIT ?
+            ''', [value for weight in weights for value in weight] + [k1, k1, b, b, average_length, limit]).fetchall()
         
+        return [
+            {
+                'pattern': row[0],
+                'response': row[1],
+                'confidence': row[2],
+                'usage_count': row[3],
+                'score': row[4]
+            }
+            for row in rows
+        ]
+    
+    # Row writers by kind, shared by synchronous and write-behind persistence
+    WRITERS = {
+        'conversations': _insert_conversations,
+        'learning': _upsert_learning,
+    }
+    
+    def get_learning_data(self, module_name: str, include_concepts: bool = False) -> List[Dict[str, Any]]:
+        """Get learning data for a module, optionally with each pattern's stored concepts"""
         db_path = self.get_module_db_path(module_name)
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
         
-        # Check if pattern already exists
-        cursor.execute('SELECT id, usage_count FROM learning_data WHERE pattern = ?', (pattern,))
-        existing = cursor.fetchone()
+        if not db_path.exists():
+            return []
         
-        if existing:
-            # Update existing pattern
+        with self._read_connection(module_name) as conn:
+            cursor = conn.cursor()
             cursor.execute('''
-                UPDATE learning_data 
-                SET response = ?, confidence = ?, usage_count = ?, last_used = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (response, confidence, existing[1] + 1, existing[0]))
-        else:
-            # Insert new pattern
-            cursor.execute('''
-                INSERT INTO learning_data (pattern, response, confidence)
-                VALUES (?, ?, ?)
-            ''', (pattern, response, confidence))
+                SELECT learning_data.id, pattern, response, confidence, usage_count, last_used
+                FROM learning_data JOIN responses ON responses.id = learning_data.response_id
+                ORDER BY confidence DESC, usage_count DESC, learning_data.id
+            ''')
+            rows = cursor.fetchall()
+            
+            concepts_by_id = {}
+            if include_concepts:
+                for concept, pattern_id in conn.execute('SELECT concept, pattern_id FROM learning_concepts'):
+                    concepts_by_id.setdefault(pattern_id, set()).add(concept)
         
-        # Update learned responses count
-        cursor.execute('''
-            INSERT OR REPLACE INTO module_stats (key, value, updated_at)
-            VALUES ('learned_responses', 
-                    (SELECT COUNT(*) FROM learning_data),
-                    CURRENT_TIMESTAMP)
-        ''')
+        learning_data = []
+        for row in rows:
+            data = {
+                'pattern': row[1],
+                'response': row[2],
+                'confidence': row[3],
+                'usage_count': row[4],
+                'last_used': row[5]
+            }
+            if include_concepts:
+                data['concepts'] = concepts_by_id.get(row[0], set())
+            learning_data.append(data)
         
-        conn.commit()
-        conn.close()
+        return learning_data
     
-    def get_learning_data(self, module_name: str) -> List[Dict[str, Any]]:
-        """Get learning data for a module"""
+    def rank_learned_responses(self, module_name: str, concepts: Iterable[str], min_score: float = 4,
+                               limit: int = 5) -> List[Dict[str, Any]]:
+        """Get the best-scoring learned responses above min_score, best first"""
+        # A pattern scores its shared concepts + confidence * 2 + min(usage_count * 0.5, 3),
+        # summed in that order; ties keep get_learning_data order
         db_path = self.get_module_db_path(module_name)
         
         if not db_path.exists():
             return []
         
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        concepts = list(set(concepts))
+        params = []
         
-        cursor.execute('''
-            SELECT pattern, response, confidence, usage_count, last_used
-            FROM learning_data
-            ORDER BY confidence DESC, usage_count DESC
-        ''')
+        # Candidates are patterns sharing a concept, found through the concept
+        # table's primary key, plus patterns whose confidence and usage alone
+        # clear the threshold, found through the score index
+        if concepts:
+            placeholders = ", ".join("(?)" for _ in concepts)
+            hits_sql = f'''
+                input_concepts (concept) AS (VALUES {placeholders}),
+                hits AS (
+                    SELECT pattern_id AS id, COUNT(*) AS overlap
+                    FROM learning_concepts JOIN input_concepts USING (concept)
+                    GROUP BY pattern_id
+                ),
+            '''
+            hits_union = 'SELECT id, overlap FROM hits UNION ALL'
+            not_hit = 'AND id NOT IN (SELECT id FROM hits)'
+            params.extend(concepts)
+        else:
+            hits_sql = hits_union = not_hit = ''
         
-        learning_data = []
-        for row in cursor.fetchall():
-            learning_data.append({
+        params.extend([min_score, min_score, limit])
+        
+        with self._read_connection(module_name) as conn:
+            rows = conn.execute(f'''
+                WITH {hits_sql}
+                candidates AS (
+                    {hits_union}
+                    SELECT id, 0 AS overlap FROM learning_data
+                    WHERE {self.BASE_SCORE_SQL} > ? {not_hit}
+                )
+                SELECT learning_data.pattern, responses.response, learning_data.confidence,
+                       learning_data.usage_count,
+                       (candidates.overlap + learning_data.confidence * 2)
+                           + MIN(learning_data.usage_count * 0.5, 3) AS score
+                FROM candidates
+                JOIN learning_data ON learning_data.id = candidates.id
+                JOIN responses ON responses.id = learning_data.response_id
+                WHERE score > ?
+                ORDER BY score DESC, learning_data.confidence DESC, learning_data.usage_count DESC, learning_data.id
+                LIMIT ?
+            ''', params).fetchall()
+        
+        return [
+            {
                 'pattern': row[0],
                 'response': row[1],
                 'confidence': row[2],
                 'usage_count': row[3],
-                'last_used': row[4]
-            })
+                'score': row[4]
+            }
+            for row in rows
+        ]
+    
+    def get_learning_summary(self, module_name: str) -> Dict[str, Any]:
+        """Get aggregate learning statistics for a module"""
+        db_path = self.get_module_db_path(module_name)
         
-        conn.close()
-        return learning_data
+        if not db_path.exists():
+            return {'avg_confidence': 0.0, 'active_patterns': 0}
+        
+        with self._read_connection(module_name) as conn:
+            avg_confidence, active_patterns = conn.execute('''
+                SELECT AVG(confidence), COUNT(CASE WHEN usage_count > 0 THEN 1 END)
+                FROM learning_data
+            ''').fetchone()
+        
+        return {
+            'avg_confidence': avg_confidence or 0.0,
+            'active_patterns': active_patterns
+        }
     
     def get_module_stats(self, module_name: str) -> Dict[str, Any]:
         """Get statistics for a module"""
@@ -186,15 +1253,53 @@ class ChatManager:
         if not db_path.exists():
             return {'learned_responses': 0, 'total_conversations': 0}
         
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT key, value FROM module_stats')
-        stats = dict(cursor.fetchall())
-        
-        conn.close()
+        with self._read_connection(module_name) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT key, value FROM module_stats')
+            stats = dict(cursor.fetchall())
         
         return {
             'learned_responses': int(stats.get('learned_responses', 0)),
             'total_conversations': int(stats.get('total_conversations', 0))
         }
+    
+    @classmethod
+    def _get_async_executor(cls) -> ThreadPoolExecutor:
+        """Get the bounded executor behind the async API"""
+        if cls._async_executor is None:
+            with cls._async_lock:
+                if cls._async_executor is None:
+                    cls._async_executor = ThreadPoolExecutor(
+                        max_workers=cls.ASYNC_WORKERS, thread_name_prefix="chat-async"
+                    )
+        return cls._async_executor
+    
+    async def _run_blocking(self, func: Callable, *args, **kwargs):
+        """Await a blocking call on the async executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_async_executor(), functools.partial(func, *args, **kwargs))
+    
+    async def asave_conversation(self, module_name: str, user_input: str, ai_response: str, context: List[Dict] = None):
+        """Awaitable save_conversation"""
+        await self._run_blocking(self.save_conversation, module_name, user_input, ai_response, context)
+    
+    async def aget_conversations(self, module_name: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Awaitable get_conversations"""
+        return await self._run_blocking(self.get_conversations, module_name, limit)
+    
+    async def asave_learning_batch(self, module_name: str, patterns: List[str], response: str, confidence: float = 1.0,
+                                   concepts: Optional[List[List[str]]] = None):
+        """Awaitable save_learning_batch"""
+        await self._run_blocking(self.save_learning_batch, module_name, patterns, response, confidence, concepts)
+    
+    async def aget_learning_data(self, module_name: str, include_concepts: bool = False) -> List[Dict[str, Any]]:
+        """Awaitable get_learning_data"""
+        return await self._run_blocking(self.get_learning_data, module_name, include_concepts)
+    
+    async def aget_module_stats(self, module_name: str) -> Dict[str, Any]:
+        """Awaitable get_module_stats"""
+        return await self._run_blocking(self.get_module_stats, module_name)
+    
+    async def aflush(self, timeout: Optional[float] = None) -> bool:
+        """Awaitable flush of queued write-behind writes"""
+        return await self._run_blocking(self.flush, timeout)
@@ -0,0 +1,69 @@
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+class KeywordMatcher:
+    """Aho-Corasick automaton finding every keyword occurring in a text in one pass"""
+    
+    def __init__(self, keywords: Iterable[str]):
+        # State 0 is the root; each state has goto edges, a failure link
+        # and the keywords ending there (including those reached via failure links)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+        self.keywords: Set[str] = set()
+        
+        for keyword in keywords:
+            if keyword and keyword not in self.keywords:
+                self.keywords.add(keyword)
+                self._insert(keyword)
+        
+        self._build_failure_links()
+    
+    def __len__(self) -> int:
+        return len(self.keywords)
+    
+    def _insert(self, keyword: str):
+        """Add a keyword to the trie"""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(keyword)
+    
+    def _build_failure_links(self):
+        """Link each state to its longest proper suffix state, breadth first"""
+        queue = deque(self._goto[0].values())
+        
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+    
+    def find(self, text: str) -> Set[str]:
+        """Get the set of keywords that occur in text, as `keyword in text` would"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        
+        hits = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                hits.update(output[state])
+        
+        return hits
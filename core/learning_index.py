@@ -0,0 +1,136 @@
+import threading
+from bisect import bisect_right
+from typing import List, Dict, Any, Iterable, Tuple
+
+class LearningIndex:
+    """In-memory inverted index over a module's learning patterns"""
+    
+    # Candidates are every pattern that can score in BaseAIModule.find_similar_response:
+    # patterns sharing a word with the input, occurring in it or containing it
+    
+    # Separates patterns in the containment corpus
+    SEPARATOR = "\x00"
+    
+    # Patterns per corpus segment; only the last, open segment is rebuilt after a write
+    SEGMENT_SIZE = 4096
+    
+    def __init__(self, rows: Iterable[Tuple] = (), version: int = 0):
+        # Learning version of the database the index reflects
+        self.version = version
+        
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._tokens: Dict[str, set] = {}
+        self._length_counts: Dict[int, int] = {}
+        self._next_seq = 1
+        
+        # Patterns joined in insertion order, for fast containment scans, in segments
+        # of SEGMENT_SIZE patterns; full segments are joined once and never change
+        self._corpus_patterns: List[str] = []
+        self._segments: List[str] = []
+        self._segment_offsets: List[List[int]] = [[]]
+        self._segment_length = 0
+        self._open_segment = ""
+        self._open_segment_dirty = False
+        
+        self._lock = threading.RLock()
+        
+        for row_id, pattern, response, confidence, usage_count in sorted(rows):
+            self._add(pattern, response, confidence, usage_count, row_id)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _add(self, pattern: str, response: str, confidence: float, usage_count: int, seq: int):
+        """Add a new pattern to the index"""
+        self._entries[pattern] = {
+            'pattern': pattern,
+            'response': response,
+            'confidence': confidence,
+            'usage_count': usage_count,
+            'seq': seq
+        }
+        self._next_seq = max(self._next_seq, seq + 1)
+        
+        for token in set(pattern.split()):
+            self._tokens.setdefault(token, set()).add(pattern)
+        
+        self._length_counts[len(pattern)] = self._length_counts.get(len(pattern), 0) + 1
+        
+        self._corpus_patterns.append(pattern)
+        self._segment_offsets[-1].append(self._segment_length)
+        self._segment_length += len(pattern) + len(self.SEPARATOR)
+        self._open_segment_dirty = True
+        
+        if len(self._segment_offsets[-1]) == self.SEGMENT_SIZE:
+            first = len(self._segments) * self.SEGMENT_SIZE
+            self._segments.append(self.SEPARATOR.join(self._corpus_patterns[first:]))
+            self._segment_offsets.append([])
+            self._segment_length = 0
+            self._open_segment = ""
+            self._open_segment_dirty = False
+    
+    def apply_upserts(self, rows: Iterable[Tuple]):
+        """Mirror ChatManager's learning upserts of (pattern, response, confidence, ...) rows"""
+        with self._lock:
+            for pattern, response, confidence, *_ in rows:
+                entry = self._entries.get(pattern)
+                if entry is None:
+                    self._add(pattern, response, confidence, 0, self._next_seq)
+                else:
+                    entry['response'] = response
+                    entry['confidence'] = confidence
+                    entry['usage_count'] += 1
+    
+    def candidates(self, text: str) -> List[Dict[str, Any]]:
+        """Get entries that may match text, in get_learning_data order"""
+        with self._lock:
+            if not text:
+                # An empty input is contained in every pattern
+                patterns = set(self._entries)
+            else:
+                patterns = set()
+                
+                for token in set(text.split()):
+                    patterns.update(self._tokens.get(token, ()))
+                
+                patterns.update(self._patterns_inside(text))
+                patterns.update(self._patterns_containing(text))
+            
+            entries = [dict(self._entries[pattern]) for pattern in patterns]
+        
+        entries.sort(key=lambda entry: (-entry['confidence'], -entry['usage_count'], entry['seq']))
+        return entries
+    
+    def _patterns_inside(self, text: str) -> Iterable[str]:
+        """Find stored patterns that occur in text"""
+        for length in self._length_counts:
+            if length > len(text):
+                continue
+            for start in range(len(text) - length + 1):
+                fragment = text[start:start + length]
+                if fragment in self._entries:
+                    yield fragment
+    
+    def _patterns_containing(self, text: str) -> Iterable[str]:
+        """Find stored patterns that contain text"""
+        if self._open_segment_dirty:
+            first = len(self._segments) * self.SEGMENT_SIZE
+            self._open_segment = self.SEPARATOR.join(self._corpus_patterns[first:])
+            self._open_segment_dirty = False
+        
+        for number, offsets in enumerate(self._segment_offsets):
+            corpus = self._segments[number] if number < len(self._segments) else self._open_segment
+            first = number * self.SEGMENT_SIZE
+            position = corpus.find(text)
+            
+            while position != -1:
+                index = bisect_right(offsets, position) - 1
+                pattern = self._corpus_patterns[first + index]
+                
+                # A match spanning a separator is not a real containment
+                if text in pattern:
+                    yield pattern
+                
+                if index + 1 >= len(offsets):
+                    break
+                position = corpus.find(text, offsets[index + 1])
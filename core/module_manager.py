@@ -1,44 +1,403 @@
 import os
+import re
 import sys
+import ast
+import asyncio
+import functools
+import atexit
+import hashlib
 import importlib.util
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+
+try:
+    from core.chat_manager import ChatManager
+except ImportError:
+    from chat_manager import ChatManager
+
+class ModuleWatcher:
+    """Background thread that polls module files and refreshes a ModuleManager when they change"""
+    
+    def __init__(self, manager: 'ModuleManager', interval: float = 2.0):
+        self.manager = manager
+        self.interval = interval
+        self.refreshes = 0
+        self.last_changes: Dict[str, List[str]] = {}
+        self._snapshot = self.snapshot()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="module-watcher", daemon=True)
+        self._thread.start()
+    
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Get the mtime and size of every module file"""
+        snapshot = {}
+        for module_file in self.manager.module_files():
+            try:
+                stat = module_file.stat()
+            except OSError:
+                # Removed while scanning
+                continue
+            snapshot[module_file.as_posix()] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+    
+    def _run(self):
+        """Poll until stopped, refreshing after any file is added, changed or removed"""
+        while not self._stop_event.wait(self.interval):
+            self.manager.evict_idle_modules()
+            
+            snapshot = self.snapshot()
+            if snapshot == self._snapshot:
+                continue
+            
+            self._snapshot = snapshot
+            try:
+                self.last_changes = self.manager.refresh_modules()
+                self.refreshes += 1
+            except Exception as e:
+                print(f"Error refreshing modules: {e}")
+    
+    def stop(self, timeout: Optional[float] = None):
+        """Stop polling"""
+        self._stop_event.set()
+        self._thread.join(timeout)
 
 class ModuleManager:
     """Manages AI modules loading and execution"""
     
-    def __init__(self):
+    # Process-wide instance shared by all sessions
+    _shared = None
+    _shared_lock = threading.Lock()
+    
+    # AIModule class attributes read at discovery time
+    METADATA_FIELDS = ('name', 'version', 'description')
+    
+    # The AIModule class statement and the first method after it bound the class header
+    CLASS_PATTERN = re.compile(r'^class AIModule\b', re.MULTILINE)
+    METHOD_PATTERN = re.compile(r'^[ \t]+(?:async[ \t]+)?(?:def[ \t]|@)', re.MULTILINE)
+    
+    # Bumped when the manifest layout changes, discarding older caches
+    MANIFEST_VERSION = 1
+    
+    # Threads scanning and importing module files in parallel
+    SCAN_WORKERS = 8
+    
+    # Threads running module responses for the async API
+    ASYNC_WORKERS = 8
+    
+    def __init__(self, max_loaded_modules: Optional[int] = None, idle_ttl: Optional[float] = None):
         self.modules_dir = Path("moduls")
+        self.manifest_path = Path("data") / "module_manifest.json"
         self.loaded_modules = {}
         self.module_configs = {}
         
+        # Loaded instances beyond max_loaded_modules, or unused for idle_ttl seconds,
+        # are evicted least recently used first and reloaded on next use
+        self.max_loaded_modules = max_loaded_modules
+        self.idle_ttl = idle_ttl
+        self._last_used: Dict[str, float] = {}
+        self._evicted = set()
+        
+        # Conversation memory of evicted instances, handed to the instance that replaces them
+        self._session_stores: Dict[str, Any] = {}
+        self._cache_metrics = {
+            'loads': 0,
+            'reloads': 0,
+            'capacity_evictions': 0,
+            'idle_evictions': 0
+        }
+        
+        # Guards module scans and instantiation; reads use the current dicts lock-free
+        self._lock = threading.RLock()
+        self._watcher = None
+        self._executor = None
+        self._async_executor = None
+        
+        # Per-module timings and errors of the last scan and of each load
+        self.scan_report: Dict[str, Any] = {}
+        self.load_timings: Dict[str, Dict[str, Any]] = {}
+        
+        # Per-module time to first chunk and total time of streamed responses
+        self._stream_metrics: Dict[str, Dict[str, float]] = {}
+        self._stream_lock = threading.Lock()
+        
         # Ensure modules directory exists
         self.modules_dir.mkdir(exist_ok=True)
         
         # Load all available modules at startup
         self.refresh_modules()
     
-    def refresh_modules(self):
-        """Refresh the list of available modules"""
-        self.loaded_modules.clear()
-        self.module_configs.clear()
+    @classmethod
+    def shared(cls, **kwargs) -> 'ModuleManager':
+        """Get the process-wide ModuleManager, scanning modules on first use only"""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls(**kwargs)
+        return cls._shared
+    
+    def start_watcher(self, interval: float = 2.0):
+        """Pick up added, changed and removed module files from a background thread"""
+        with self._lock:
+            if self._watcher is None:
+                self._watcher = ModuleWatcher(self, interval)
+    
+    def stop_watcher(self, timeout: Optional[float] = None):
+        """Stop watching the modules directory"""
+        with self._lock:
+            watcher, self._watcher = self._watcher, None
         
-        # Scan modules directory, excluding base_module.py
-        for module_file in self.modules_dir.glob("*_module.py"):
-            # Skip base_module.py as it's not a concrete AI module
-            if module_file.name == "base_module.py":
-                continue
-            try:
-                self._load_module_config(module_file)
-            except Exception as e:
-                print(f"Error loading module {module_file}: {e}")
+        if watcher is not None:
+            watcher.stop(timeout)
+    
+    def enable_process_execution(self, max_workers: int = 2, timeout: float = 10.0,
+                                 max_calls_per_worker: int = 500):
+        """Run module responses in warm worker processes with a per-call deadline"""
+        try:
+            from core.process_executor import ProcessExecutor
+        except ImportError:
+            from process_executor import ProcessExecutor
+        
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessExecutor(max_workers, timeout, max_calls_per_worker)
+                atexit.register(self.disable_process_execution)
     
-    def _load_module_config(self, module_file: Path):
-        """Load module configuration and basic info"""
+    def disable_process_execution(self):
+        """Stop the worker processes and return to running modules in-process"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        
+        if executor is not None:
+            executor.shutdown()
+    
+    def get_execution_metrics(self) -> Optional[Dict[str, Any]]:
+        """Get worker process counters, if process execution is enabled"""
+        executor = self._executor
+        return executor.get_metrics() if executor is not None else None
+    
+    def module_files(self) -> List[Path]:
+        """List the module files in the modules directory"""
+        # Skip base_module.py as it's not a concrete AI module
+        return [
+            module_file for module_file in self.modules_dir.glob("*_module.py")
+            if module_file.name != "base_module.py"
+        ]
+    
+    def refresh_modules(self) -> Dict[str, List[str]]:
+        """Refresh the list of available modules, re-reading only files that changed"""
+        with self._lock:
+            manifest = self._read_manifest()
+            started = time.perf_counter()
+            
+            # Scan modules directory in parallel, so a slow module only delays itself
+            with ThreadPoolExecutor(max_workers=self.SCAN_WORKERS, thread_name_prefix="module-scan") as pool:
+                results = list(pool.map(
+                    lambda module_file: self._scan_module_file(module_file, manifest.get(module_file.as_posix())),
+                    self.module_files()
+                ))
+            
+            new_manifest = {}
+            configs = {}
+            for report, entry, config in results:
+                if report['error'] is not None:
+                    print(f"Error loading module {report['file']}: {report['error']}")
+                    continue
+                new_manifest[report['file']] = entry
+                configs[report['module']] = config
+            
+            self.scan_report = {
+                'scan_seconds': round(time.perf_counter() - started, 6),
+                'workers': self.SCAN_WORKERS,
+                'modules': sorted((report for report, _, _ in results), key=lambda report: -report['seconds'])
+            }
+            
+            # Unchanged modules keep their imported class, running instance and session memory
+            loaded_modules = {}
+            session_stores = {}
+            for module_name, config in configs.items():
+                previous = self.module_configs.get(module_name)
+                if previous is None or previous['hash'] != config['hash']:
+                    continue
+                if config['class'] is None:
+                    config['class'] = previous['class']
+                if previous['name'] == config['name'] and previous['name'] in self._session_stores:
+                    session_stores[config['name']] = self._session_stores[previous['name']]
+                if previous['name'] == config['name'] and previous['name'] in self.loaded_modules:
+                    loaded_modules[config['name']] = self.loaded_modules[previous['name']]
+            
+            if new_manifest != manifest:
+                self._write_manifest(new_manifest)
+            
+            changes = {
+                'added': sorted(configs.keys() - self.module_configs.keys()),
+                'changed': sorted(
+                    module_name for module_name in configs.keys() & self.module_configs.keys()
+                    if configs[module_name]['hash'] != self.module_configs[module_name]['hash']
+                ),
+                'removed': sorted(self.module_configs.keys() - configs.keys())
+            }
+            
+            # Swap in the new scan so concurrent readers never see a partial one;
+            # in-flight responses keep the instance they already hold
+            self.module_configs = configs
+            self.loaded_modules = loaded_modules
+            self._session_stores = session_stores
+            self._last_used = {
+                module_name: self._last_used.get(module_name, time.monotonic())
+                for module_name in loaded_modules
+            }
+            return changes
+    
+    def _read_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Read the cached module metadata, keyed by module file path"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        if not isinstance(manifest, dict) or manifest.get('version') != self.MANIFEST_VERSION:
+            return {}
+        return manifest.get('modules', {})
+    
+    def _write_manifest(self, modules: Dict[str, Dict[str, Any]]):
+        """Atomically replace the cached module metadata"""
+        try:
+            self.manifest_path.parent.mkdir(exist_ok=True)
+            temp_path = self.manifest_path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.MANIFEST_VERSION, 'modules': modules}, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.manifest_path)
+        except (OSError, TypeError) as e:
+            print(f"Error writing module manifest: {e}")
+    
+    def _scan_module_file(self, module_file: Path, cached: Optional[Dict[str, Any]]):
+        """Scan one module file, timing it and capturing any error"""
+        report = {
+            'module': module_file.stem,
+            'file': module_file.as_posix(),
+            'status': 'error',
+            'seconds': 0.0,
+            'error': None
+        }
+        entry = config = None
+        
+        started = time.perf_counter()
+        try:
+            entry, config, report['status'] = self._load_module_config(module_file, cached)
+        except Exception as e:
+            report['error'] = str(e)
+        report['seconds'] = round(time.perf_counter() - started, 6)
+        
+        return report, entry, config
+    
+    def _load_module_config(self, module_file: Path, cached: Optional[Dict[str, Any]] = None):
+        """Load module configuration and basic info, with its manifest entry and how it was read"""
+        stat = module_file.stat()
+        module_class = None
+        
+        if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+            # Untouched since the last scan
+            entry = cached
+            status = 'cached'
+        else:
+            digest = hashlib.sha1(module_file.read_bytes()).hexdigest()
+            if cached and cached['hash'] == digest:
+                # Touched but not changed
+                entry = dict(cached, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                status = 'unchanged'
+            else:
+                metadata, module_class = self._read_module_metadata(module_file)
+                entry = dict(metadata, mtime_ns=stat.st_mtime_ns, size=stat.st_size, hash=digest)
+                status = 'parsed' if module_class is None else 'imported'
+        
+        config = {
+            'name': entry['name'],
+            'version': entry['version'],
+            'description': entry['description'],
+            'file_path': module_file,
+            'hash': entry['hash'],
+            'class': module_class
+        }
+        return entry, config, status
+    
+    def _read_module_metadata(self, module_file: Path):
+        """Read a module's metadata, and its class if it had to be imported"""
         module_name = module_file.stem
         
-        # Import the module
+        # Read the metadata from source; the module is only executed when loaded
+        metadata = self._read_static_metadata(module_file)
+        module_class = None
+        
+        if metadata is None:
+            # Metadata that is computed or inherited needs the real class
+            module_class = self._import_module_class(module_name, module_file)
+            metadata = {
+                'name': getattr(module_class, 'name', module_name),
+                'version': getattr(module_class, 'version', '1.0.0'),
+                'description': getattr(module_class, 'description', 'AI Module')
+            }
+        
+        return metadata, module_class
+    
+    def _read_static_metadata(self, module_file: Path) -> Optional[Dict[str, Any]]:
+        """Read AIModule's literal metadata attributes without executing the module"""
+        source = module_file.read_text(encoding='utf-8')
+        
+        # Metadata sits above the methods, so parsing the class header is usually enough
+        tree = self._parse_class_header(source)
+        if tree is None:
+            tree = ast.parse(source, filename=str(module_file))
+        
+        class_node = None
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and node.name == 'AIModule':
+                class_node = node
+        
+        if class_node is None:
+            raise AttributeError(f"Module {module_file.stem} must have AIModule class")
+        
+        metadata = {}
+        for node in class_node.body:
+            if isinstance(node, ast.Assign):
+                targets, value = node.targets, node.value
+            elif isinstance(node, ast.AnnAssign) and node.value is not None:
+                targets, value = [node.target], node.value
+            else:
+                continue
+            
+            for target in targets:
+                if isinstance(target, ast.Name) and target.id in self.METADATA_FIELDS:
+                    try:
+                        metadata[target.id] = ast.literal_eval(value)
+                    except ValueError:
+                        metadata.pop(target.id, None)
+        
+        if any(field not in metadata for field in self.METADATA_FIELDS):
+            return None
+        return metadata
+    
+    def _parse_class_header(self, source: str) -> Optional[ast.Module]:
+        """Parse AIModule's statements up to its first method, if they parse on their own"""
+        class_match = self.CLASS_PATTERN.search(source)
+        if class_match is None:
+            return None
+        
+        method_match = self.METHOD_PATTERN.search(source, class_match.end())
+        end = method_match.start() if method_match else len(source)
+        
+        try:
+            return ast.parse(source[class_match.start():end])
+        except SyntaxError:
+            return None
+    
+    @staticmethod
+    def _import_module_class(module_name: str, module_file: Path):
+        """Execute a module file and get its AIModule class"""
         spec = importlib.util.spec_from_file_location(module_name, module_file)
         if spec is None or spec.loader is None:
             raise ImportError(f"Cannot load module spec for {module_file}")
@@ -50,15 +409,7 @@ class ModuleManager:
         if not hasattr(module, 'AIModule'):
             raise AttributeError(f"Module {module_name} must have AIModule class")
         
-        # Store module info
-        module_class = getattr(module, 'AIModule')
-        self.module_configs[module_name] = {
-            'name': getattr(module_class, 'name', module_name),
-            'version': getattr(module_class, 'version', '1.0.0'),
-            'description': getattr(module_class, 'description', 'AI Module'),
-            'file_path': module_file,
-            'class': module_class
-        }
+        return getattr(module, 'AIModule')
     
     def get_available_modules(self) -> List[Dict[str, Any]]:
         """Get list of available modules"""
@@ -72,38 +423,295 @@ class ModuleManager:
         ]
     
     def load_module(self, module_name: str) -> bool:
-        """Load a specific module for use"""
-        # Find module by name
-        target_config = None
-        for config in self.module_configs.values():
-            if config['name'] == module_name:
-                target_config = config
-                break
+        """Load a specific module for use, reusing an already loaded instance"""
+        with self._lock:
+            if module_name in self.loaded_modules:
+                self._last_used[module_name] = time.monotonic()
+                return True
+            
+            target_config = self._find_config(module_name)
+            if not target_config:
+                return False
+            
+            timings = {'import_seconds': None, 'init_seconds': None, 'error': None}
+            self.load_timings[module_name] = timings
+            try:
+                # Import the module on first use
+                if target_config['class'] is None:
+                    started = time.perf_counter()
+                    target_config['class'] = self._import_module_class(
+                        target_config['file_path'].stem, target_config['file_path']
+                    )
+                    timings['import_seconds'] = round(time.perf_counter() - started, 6)
+                
+                # Initialize module instance
+                started = time.perf_counter()
+                module_instance = target_config['class']()
+                timings['init_seconds'] = round(time.perf_counter() - started, 6)
+                
+                # A reloaded instance carries on its predecessor's conversations
+                sessions = self._session_stores.pop(module_name, None)
+                if sessions is not None and hasattr(module_instance, 'sessions'):
+                    sessions.factory = module_instance.new_session_state
+                    module_instance.sessions = sessions
+                
+                self.loaded_modules[module_name] = module_instance
+                self._last_used[module_name] = time.monotonic()
+            except Exception as e:
+                timings['error'] = str(e)
+                print(f"Error initializing module {module_name}: {e}")
+                return False
+            
+            self._cache_metrics['loads'] += 1
+            if module_name in self._evicted:
+                self._evicted.discard(module_name)
+                self._cache_metrics['reloads'] += 1
+            
+            self.evict_idle_modules()
+            if self.max_loaded_modules is not None:
+                while len(self.loaded_modules) > self.max_loaded_modules:
+                    least_recent = min(self.loaded_modules, key=lambda name: self._last_used.get(name, 0))
+                    self._evict(least_recent)
+                    self._cache_metrics['capacity_evictions'] += 1
+            return True
+    
+    def preload_modules(self, module_names: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Import module classes ahead of first use, in parallel; instances are still created on load"""
+        with self._lock:
+            targets = [
+                config for config in self.module_configs.values()
+                if config['class'] is None and (module_names is None or config['name'] in module_names)
+            ]
+            
+            def import_class(config):
+                timings = {'import_seconds': None, 'init_seconds': None, 'error': None}
+                started = time.perf_counter()
+                try:
+                    config['class'] = self._import_module_class(config['file_path'].stem, config['file_path'])
+                except Exception as e:
+                    timings['error'] = str(e)
+                    print(f"Error importing module {config['name']}: {e}")
+                timings['import_seconds'] = round(time.perf_counter() - started, 6)
+                return config['name'], timings
+            
+            with ThreadPoolExecutor(max_workers=self.SCAN_WORKERS, thread_name_prefix="module-import") as pool:
+                results = dict(pool.map(import_class, targets))
+            
+            self.load_timings.update(results)
+            return results
+    
+    def get_load_report(self, limit: int = 10) -> Dict[str, Any]:
+        """Get the slowest module scans and loads, and every module that failed"""
+        with self._lock:
+            scanned = self.scan_report.get('modules', [])
+            loads = [
+                dict(timings, module=module_name,
+                     seconds=(timings['import_seconds'] or 0) + (timings['init_seconds'] or 0))
+                for module_name, timings in self.load_timings.items()
+            ]
+            
+            return {
+                'scan_seconds': self.scan_report.get('scan_seconds'),
+                'scanned_modules': len(scanned),
+                'slowest_scans': scanned[:limit],
+                'slowest_loads': sorted(loads, key=lambda timings: -timings['seconds'])[:limit],
+                'errors': [report for report in scanned if report['error'] is not None] +
+                          [timings for timings in loads if timings['error'] is not None]
+            }
+    
+    def _evict(self, module_name: str):
+        """Drop a loaded instance and its learning index; the next use loads a fresh one"""
+        module_instance = self.loaded_modules.pop(module_name, None)
+        self._last_used.pop(module_name, None)
+        self._evicted.add(module_name)
         
-        if not target_config:
-            return False
+        # Session memory outlives the instance, so eviction stays invisible to users
+        sessions = getattr(module_instance, 'sessions', None)
+        if sessions is not None and len(sessions):
+            self._session_stores[module_name] = sessions
         
-        try:
-            # Initialize module instance
-            module_instance = target_config['class']()
-            self.loaded_modules[module_name] = module_instance
-            return True
-        except Exception as e:
-            print(f"Error initializing module {module_name}: {e}")
-            return False
+        # The learning index is shared by database, not held by the instance
+        chat_manager = getattr(module_instance, 'chat_manager', None)
+        if hasattr(chat_manager, 'release_learning_index'):
+            chat_manager.release_learning_index(module_name)
     
-    def get_response(self, module_name: str, user_input: str, chat_history: List[Dict]) -> str:
-        """Get response from specified module"""
-        if module_name not in self.loaded_modules:
+    def evict_idle_modules(self) -> int:
+        """Evict instances unused for longer than idle_ttl, returning how many were evicted"""
+        if self.idle_ttl is None:
+            return 0
+        
+        with self._lock:
+            cutoff = time.monotonic() - self.idle_ttl
+            idle = [
+                module_name for module_name in list(self.loaded_modules)
+                if self._last_used.get(module_name, 0) < cutoff
+            ]
+            for module_name in idle:
+                self._evict(module_name)
+            self._cache_metrics['idle_evictions'] += len(idle)
+            return len(idle)
+    
+    def get_cache_metrics(self) -> Dict[str, Any]:
+        """Get loaded-instance counts and load/eviction counters"""
+        with self._lock:
+            now = time.monotonic()
+            metrics = dict(self._cache_metrics)
+            metrics.update({
+                'resident_modules': len(self.loaded_modules),
+                'parked_session_stores': len(self._session_stores),
+                'max_loaded_modules': self.max_loaded_modules,
+                'idle_ttl': self.idle_ttl,
+                'idle_seconds': {
+                    module_name: round(now - self._last_used.get(module_name, now), 3)
+                    for module_name in list(self.loaded_modules)
+                },
+                'learning_indexes': ChatManager.get_learning_index_metrics()
+            })
+            return metrics
+    
+    def _find_config(self, module_name: str) -> Optional[Dict[str, Any]]:
+        """Find a module's config by its display name"""
+        for config in self.module_configs.values():
+            if config['name'] == module_name:
+                return config
+        return None
+    
+    def _get_instance(self, module_name: str):
+        """Get a loaded module instance, loading it on first use"""
+        module_instance = self.loaded_modules.get(module_name)
+        if module_instance is not None:
+            self._last_used[module_name] = time.monotonic()
+            return module_instance
+        
+        with self._lock:
             if not self.load_module(module_name):
+                return None
+            return self.loaded_modules.get(module_name)
+    
+    def get_response(self, module_name: str, user_input: str, chat_history: List[Dict],
+                     session_id: Optional[str] = None) -> str:
+        """Get response from specified module, using the session's conversation memory"""
+        executor = self._executor
+        if executor is not None:
+            config = self._find_config(module_name)
+            if config is None:
                 return "Chyba: Nelze načíst AI modul"
+            return executor.call(config['file_path'], config['hash'], user_input, chat_history, session_id)
+        
+        module_instance = self._get_instance(module_name)
+        if module_instance is None:
+            return "Chyba: Nelze načíst AI modul"
         
         try:
-            module_instance = self.loaded_modules[module_name]
+            if hasattr(module_instance, 'respond'):
+                return module_instance.respond(user_input, chat_history, session_id)
             return module_instance.generate_response(user_input, chat_history)
         except Exception as e:
             return f"Chyba při generování odpovědi: {str(e)}"
     
+    def get_response_stream(self, module_name: str, user_input: str, chat_history: List[Dict],
+                            session_id: Optional[str] = None) -> Iterator[str]:
+        """Stream a response from specified module in chunks, recording the time to the first chunk"""
+        started = time.perf_counter()
+        first_chunk_ms = None
+        chunks = self._response_chunks(module_name, user_input, chat_history, session_id)
+        try:
+            for chunk in chunks:
+                if first_chunk_ms is None:
+                    first_chunk_ms = (time.perf_counter() - started) * 1000
+                yield chunk
+        finally:
+            # Closing the module's stream lets it finish the turn, e.g. learn from it
+            chunks.close()
+            self._record_stream(module_name, first_chunk_ms, (time.perf_counter() - started) * 1000)
+    
+    def _response_chunks(self, module_name: str, user_input: str, chat_history: List[Dict],
+                         session_id: Optional[str]) -> Iterator[str]:
+        """Yield a module's response chunks, or one error message"""
+        executor = self._executor
+        if executor is not None:
+            # Worker processes return whole responses
+            config = self._find_config(module_name)
+            if config is None:
+                yield "Chyba: Nelze načíst AI modul"
+                return
+            yield executor.call(config['file_path'], config['hash'], user_input, chat_history, session_id)
+            return
+        
+        module_instance = self._get_instance(module_name)
+        if module_instance is None:
+            yield "Chyba: Nelze načíst AI modul"
+            return
+        
+        try:
+            if hasattr(module_instance, 'respond_stream'):
+                yield from module_instance.respond_stream(user_input, chat_history, session_id)
+            else:
+                yield module_instance.generate_response(user_input, chat_history)
+        except Exception as e:
+            yield f"Chyba při generování odpovědi: {str(e)}"
+    
+    def _record_stream(self, module_name: str, first_chunk_ms: Optional[float], total_ms: float):
+        """Add one streamed response to the module's streaming metrics"""
+        with self._stream_lock:
+            metrics = self._stream_metrics.setdefault(module_name, {
+                'streams': 0,
+                'empty_streams': 0,
+                'last_ttfb_ms': 0.0,
+                'max_ttfb_ms': 0.0,
+                'total_ttfb_ms': 0.0,
+                'total_ms': 0.0
+            })
+            metrics['streams'] += 1
+            metrics['total_ms'] += total_ms
+            if first_chunk_ms is None:
+                metrics['empty_streams'] += 1
+                return
+            metrics['last_ttfb_ms'] = first_chunk_ms
+            metrics['total_ttfb_ms'] += first_chunk_ms
+            metrics['max_ttfb_ms'] = max(metrics['max_ttfb_ms'], first_chunk_ms)
+    
+    def get_stream_metrics(self, module_name: Optional[str] = None) -> Dict[str, Any]:
+        """Get time-to-first-chunk metrics of streamed responses, per module or for one module"""
+        with self._stream_lock:
+            modules = {name: dict(metrics) for name, metrics in self._stream_metrics.items()}
+        
+        for metrics in modules.values():
+            timed = metrics['streams'] - metrics['empty_streams']
+            metrics['avg_ttfb_ms'] = metrics['total_ttfb_ms'] / timed if timed else 0.0
+            metrics['avg_total_ms'] = metrics['total_ms'] / metrics['streams']
+        
+        if module_name is not None:
+            return modules.get(module_name, {'streams': 0})
+        return modules
+    
+    def get_responses(self, module_name: str, inputs: List[str], histories: Optional[List[List[Dict]]] = None,
+                      session_id: Optional[str] = None) -> List[str]:
+        """Get responses to many inputs as consecutive turns, in a few large database transactions"""
+        if histories is None:
+            histories = [[] for _ in inputs]
+        
+        executor = self._executor
+        if executor is not None:
+            # Worker processes answer one input per call
+            config = self._find_config(module_name)
+            if config is None:
+                return ["Chyba: Nelze načíst AI modul"] * len(inputs)
+            return [executor.call(config['file_path'], config['hash'], user_input, chat_history, session_id)
+                    for user_input, chat_history in zip(inputs, histories)]
+        
+        module_instance = self._get_instance(module_name)
+        if module_instance is None:
+            return ["Chyba: Nelze načíst AI modul"] * len(inputs)
+        
+        try:
+            if hasattr(module_instance, 'respond_batch'):
+                return module_instance.respond_batch(inputs, histories, session_id)
+            return [module_instance.generate_response(user_input, chat_history)
+                    for user_input, chat_history in zip(inputs, histories)]
+        except Exception as e:
+            return [f"Chyba při generování odpovědi: {str(e)}"] * len(inputs)
+    
     def get_module_info(self, module_name: str) -> Optional[Dict[str, Any]]:
         """Get information about a specific module"""
         for config in self.module_configs.values():
@@ -117,15 +725,38 @@ class ModuleManager:
     
     def get_module_stats(self, module_name: str) -> Optional[Dict[str, Any]]:
         """Get statistics for a specific module"""
-        if module_name not in self.loaded_modules:
-            if not self.load_module(module_name):
-                return None
+        module_instance = self._get_instance(module_name)
+        if module_instance is None:
+            return None
         
         try:
-            module_instance = self.loaded_modules[module_name]
             if hasattr(module_instance, 'get_stats'):
                 return module_instance.get_stats()
         except Exception as e:
             print(f"Error getting stats for {module_name}: {e}")
         
         return None
+    
+    def _get_async_executor(self) -> ThreadPoolExecutor:
+        """Get the bounded executor behind the async API, created on first use"""
+        if self._async_executor is None:
+            with self._lock:
+                if self._async_executor is None:
+                    self._async_executor = ThreadPoolExecutor(
+                        max_workers=self.ASYNC_WORKERS, thread_name_prefix="module-async"
+                    )
+        return self._async_executor
+    
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Await a blocking call on the async executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_async_executor(), functools.partial(func, *args, **kwargs))
+    
+    async def aget_response(self, module_name: str, user_input: str, chat_history: List[Dict],
+                            session_id: Optional[str] = None) -> str:
+        """Awaitable get_response"""
+        return await self._run_blocking(self.get_response, module_name, user_input, chat_history, session_id)
+    
+    async def aget_module_stats(self, module_name: str) -> Optional[Dict[str, Any]]:
+        """Awaitable get_module_stats"""
+        return await self._run_blocking(self.get_module_stats, module_name)
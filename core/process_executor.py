@@ -0,0 +1,245 @@
+import multiprocessing
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+def _worker_main(conn):
+    """Serve generate_response calls in a worker process until told to stop"""
+    try:
+        from core.module_manager import ModuleManager
+    except ImportError:
+        from module_manager import ModuleManager
+    
+    # Warm instances, keyed by module file and content hash so edited modules reload
+    instances = {}
+    
+    def get_instance(file_path: str, file_hash: str):
+        module_instance = instances.get((file_path, file_hash))
+        if module_instance is None:
+            module_class = ModuleManager._import_module_class(Path(file_path).stem, Path(file_path))
+            module_instance = instances[(file_path, file_hash)] = module_class()
+        return module_instance
+    
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        
+        if request[0] == 'warm':
+            # Load the modules a replaced worker had served before taking calls
+            for file_path, file_hash in request[1]:
+                try:
+                    get_instance(file_path, file_hash)
+                except Exception as e:
+                    print(f"Error warming module {file_path}: {e}")
+            conn.send(('ready', None))
+            continue
+        
+        file_path, file_hash, user_input, chat_history, session_id = request
+        try:
+            module_instance = get_instance(file_path, file_hash)
+            
+            if hasattr(module_instance, 'respond'):
+                response = module_instance.respond(user_input, chat_history, session_id)
+            else:
+                response = module_instance.generate_response(user_input, chat_history)
+            conn.send(('ok', response))
+        except Exception as e:
+            conn.send(('error', str(e)))
+
+class _Worker:
+    """One worker process and the pipe to it"""
+    
+    def __init__(self, context, modules: Iterable[Tuple[str, str]] = ()):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), name="module-worker", daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.calls = 0
+        self.lock = threading.Lock()
+        
+        # (file path, hash) of the modules this worker has served
+        self.modules = set(modules)
+        
+        # Set until the worker has loaded the modules it was started with
+        self.warming = bool(self.modules)
+        if self.warming:
+            self.conn.send(('warm', sorted(self.modules)))
+    
+    def wait_ready(self, timeout: float) -> bool:
+        """Wait for the worker to finish warming up; False if it did not in time"""
+        if self.warming:
+            try:
+                if not self.conn.poll(timeout):
+                    return False
+                self.conn.recv()
+            except (EOFError, OSError):
+                return False
+            self.warming = False
+        return True
+    
+    def stop(self, timeout: float = 1.0):
+        """Ask the process to exit, killing it if it does not"""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        self.kill()
+    
+    def kill(self):
+        """Kill the process immediately"""
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(1.0)
+        self.conn.close()
+
+class ProcessExecutor:
+    """Pool of warm worker processes running module responses with per-call deadlines"""
+    
+    TIMEOUT_MESSAGE = "Chyba: Modul neodpověděl včas"
+    CLOSED_MESSAGE = "Chyba: Pracovní procesy modulů nejsou spuštěny"
+    
+    # Seconds a replacement worker may take to load the modules of the one it replaces
+    WARM_TIMEOUT = 30.0
+    
+    def __init__(self, max_workers: int = 2, timeout: float = 10.0, max_calls_per_worker: int = 500):
+        self.timeout = timeout
+        self.max_calls_per_worker = max_calls_per_worker
+        
+        # Spawned workers do not inherit the parent's threads or open database connections
+        self._context = multiprocessing.get_context('spawn')
+        self._workers: List[_Worker] = [_Worker(self._context) for _ in range(max_workers)]
+        self._workers_lock = threading.Lock()
+        self._next_worker = 0
+        self._metrics = {
+            'calls': 0,
+            'timeouts': 0,
+            'errors': 0,
+            'recycled_workers': 0,
+            'killed_workers': 0
+        }
+        self._metrics_lock = threading.Lock()
+    
+    def _count(self, metric: str):
+        with self._metrics_lock:
+            self._metrics[metric] += 1
+    
+    def _pick_worker(self, session_id: Optional[str]) -> Optional[int]:
+        """Pin a session to one worker so its conversation memory stays in one process; None once shut down"""
+        with self._workers_lock:
+            if not self._workers:
+                return None
+            
+            if session_id is not None:
+                return zlib.crc32(session_id.encode('utf-8')) % len(self._workers)
+            
+            index = self._next_worker % len(self._workers)
+            self._next_worker = (index + 1) % len(self._workers)
+            return index
+    
+    def _get_worker(self, index: int) -> Optional[_Worker]:
+        """Get the worker currently at index; None once shut down"""
+        with self._workers_lock:
+            return self._workers[index] if index < len(self._workers) else None
+    
+    def _replace_worker(self, index: int, worker: _Worker, kill: bool, warm: bool = True):
+        """Swap a fresh process in for a timed-out or worn-out worker, preloading the modules it served"""
+        with self._workers_lock:
+            if index < len(self._workers) and self._workers[index] is worker:
+                self._workers[index] = _Worker(self._context, worker.modules if warm else ())
+        
+        if kill:
+            worker.kill()
+        else:
+            worker.stop()
+    
+    def call(self, file_path: Path, file_hash: str, user_input: str, chat_history: List[Dict],
+             session_id: Optional[str] = None, timeout: Optional[float] = None) -> str:
+        """Run a module's response in a worker, returning a fallback message past the deadline"""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        index = self._pick_worker(session_id)
+        if index is None:
+            return self.CLOSED_MESSAGE
+        
+        while True:
+            worker = self._get_worker(index)
+            if worker is None:
+                return self.CLOSED_MESSAGE
+            
+            # Waiting for a busy worker counts against the same deadline
+            if not worker.lock.acquire(timeout=max(deadline - time.monotonic(), 0)):
+                self._count('timeouts')
+                return self.TIMEOUT_MESSAGE
+            
+            # The worker may have been replaced or shut down while we waited
+            if self._get_worker(index) is worker:
+                break
+            worker.lock.release()
+        
+        try:
+            # A replacement loads its modules first; that does not count against the call's deadline
+            if worker.warming:
+                if not worker.wait_ready(self.WARM_TIMEOUT):
+                    self._count('timeouts')
+                    self._count('killed_workers')
+                    self._replace_worker(index, worker, kill=True, warm=False)
+                    return self.TIMEOUT_MESSAGE
+                deadline = time.monotonic() + timeout
+            
+            self._count('calls')
+            try:
+                worker.conn.send((str(file_path), file_hash, user_input, chat_history, session_id))
+                ready = worker.conn.poll(max(deadline - time.monotonic(), 0))
+                status, result = worker.conn.recv() if ready else (None, None)
+            except (EOFError, OSError) as e:
+                # The worker died; replace it like a timed-out one
+                ready, status, result = False, 'error', f"Worker process failed: {e}"
+            
+            if not ready:
+                # Cancel the call by killing its process
+                self._count('killed_workers')
+                if status is None:
+                    self._count('timeouts')
+                    result = self.TIMEOUT_MESSAGE
+                else:
+                    self._count('errors')
+                    result = f"Chyba při generování odpovědi: {result}"
+                self._replace_worker(index, worker, kill=True)
+                return result
+            
+            worker.calls += 1
+            if status == 'ok':
+                worker.modules.add((str(file_path), file_hash))
+            if worker.calls >= self.max_calls_per_worker:
+                self._count('recycled_workers')
+                self._replace_worker(index, worker, kill=False)
+            
+            if status == 'error':
+                self._count('errors')
+                return f"Chyba při generování odpovědi: {result}"
+            return result
+        finally:
+            worker.lock.release()
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get call, timeout and worker recycling counters"""
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        metrics['workers'] = len(self._workers)
+        metrics['alive_workers'] = sum(worker.process.is_alive() for worker in self._workers)
+        return metrics
+    
+    def shutdown(self):
+        """Stop every worker process"""
+        with self._workers_lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            with worker.lock:
+                worker.stop()
@@ -0,0 +1,43 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+class RetrievalEngine(ABC):
+    """Strategy a module uses to find learned responses"""
+    
+    name = "base"
+    
+    def prepare(self, chat_manager, module_name: str):
+        """Set up any persisted state the engine needs for a module"""
+        pass
+    
+    @abstractmethod
+    def find_response(self, chat_manager, module_name: str, user_input: str) -> Optional[str]:
+        """Find a learned response for user input"""
+        pass
+
+class BM25Retrieval(RetrievalEngine):
+    """BM25-ranked retrieval over a persisted index of learning patterns"""
+    
+    name = "bm25"
+    
+    def __init__(self, k1: float = 1.2, b: float = 0.75, min_score: float = 1.0,
+                 max_postings: Optional[int] = 50000):
+        self.k1 = k1
+        self.b = b
+        self.min_score = min_score
+        self.max_postings = max_postings
+    
+    def prepare(self, chat_manager, module_name: str):
+        """Build the module's BM25 index and keep it updated on learning writes"""
+        chat_manager.enable_bm25_index(module_name)
+    
+    def find_response(self, chat_manager, module_name: str, user_input: str) -> Optional[str]:
+        """Find the best BM25 match for user input, if it scores high enough"""
+        matches = chat_manager.search_bm25(
+            module_name, user_input, k1=self.k1, b=self.b, limit=1, max_postings=self.max_postings
+        )
+        
+        if matches and matches[0]['score'] >= self.min_score:
+            return matches[0]['response']
+        
+        return None
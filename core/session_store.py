@@ -0,0 +1,53 @@
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+# Session served by the current call; BaseAIModule.respond sets it around generate_response
+DEFAULT_SESSION_ID = "default"
+current_session_id: ContextVar[str] = ContextVar('current_session_id', default=DEFAULT_SESSION_ID)
+
+class SessionStore:
+    """Bounded per-session state with least-recently-used eviction"""
+    
+    def __init__(self, factory: Callable[[], Any], max_sessions: int = 256):
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+    
+    def get(self, session_id: Optional[str] = None) -> Any:
+        """Get a session's state, creating it and evicting the idlest session if needed"""
+        if session_id is None:
+            session_id = current_session_id.get()
+        
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is not None:
+                self._sessions.move_to_end(session_id)
+                return state
+            
+            state = self.factory()
+            self._sessions[session_id] = state
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+            return state
+    
+    def discard(self, session_id: str):
+        """Forget a session's state"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+    
+    def get_metrics(self) -> Dict[str, int]:
+        """Get session counts for monitoring"""
+        with self._lock:
+            return {
+                'active_sessions': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'evicted_sessions': self.evictions
+            }
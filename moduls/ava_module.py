@@ -3,14 +3,45 @@ import string
 import re
 import math
 import statistics
+from contextlib import closing
 from datetime import datetime
-from typing import List, Dict, Any
+from types import MappingProxyType
+from typing import List, Dict, Any, Iterator, Optional, Set
 from pathlib import Path
 import sys
 
 # Add current directory to path for imports
 sys.path.append(str(Path(__file__).parent))
 from base_module import BaseAIModule
+try:
+    from core.keyword_matcher import KeywordMatcher
+except ImportError:
+    from keyword_matcher import KeywordMatcher
+
+def freeze_table(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze_table(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze_table(item) for item in value)
+    return value
+
+class AnalyzedInput:
+    """One user input, normalized, tokenized and classified once per turn"""
+    
+    def __init__(self, original: str, clean: str, concepts: List[str], clean_concepts: List[str],
+                 numbers: List[str], hits: Set[str]):
+        self.original = original
+        self.words = original.split()
+        self.concepts = concepts
+        
+        # clean_input output is already lowercase
+        self.clean = clean
+        self.clean_words = clean.split()
+        self.clean_concepts = clean_concepts
+        
+        self.numbers = numbers
+        self.hits = hits
 
 class AIModule(BaseAIModule):
     """A.v.A - Advanced virtual Assistant module"""
@@ -19,201 +50,292 @@ class AIModule(BaseAIModule):
     version = "3.0.0"
     description = "Advanced virtual Assistant with sophisticated AI-like reasoning, natural language understanding, and adaptive learning - fully local, no external APIs"
     
-    def __init__(self):
-        super().__init__()
-        
-        # Enhanced response templates
-        self.response_templates = {
-            'greeting': [
-                "Hello! How can I assist you today?",
-                "Hi there! What would you like to know or discuss?",
-                "Good day! I'm here to help with any questions or tasks.",
-                "Welcome! How may I be of service?",
-                "Greetings! What can I help you with?"
-            ],
-            'question': [
-                "That's an interesting question. Based on my analysis, {}",
-                "Let me think about this carefully. I believe {}",
-                "From what I understand, {} seems to be the most likely answer.",
-                "After considering the factors, {}",
-                "This is a good question. My reasoning suggests that {}"
-            ],
-            'calculation': [
-                "Let me calculate that for you: {}",
-                "Based on my calculations: {}",
-                "The mathematical result is: {}",
-                "After computing this: {}",
-                "The answer to your calculation is: {}"
-            ],
-            'analysis': [
-                "After analyzing the information: {}",
-                "My detailed analysis shows: {}",
-                "Breaking this down systematically: {}",
-                "Based on the data patterns: {}",
-                "From a logical perspective: {}"
-            ],
-            'unknown': [
-                "I'm not entirely sure about that. Could you provide more context?",
-                "That's interesting, but I need more information to give you a proper answer.",
-                "I'd like to help, but could you clarify what you're asking?",
-                "That's outside my current knowledge. Can you explain it differently?",
-                "I'm still learning about that topic. Could you be more specific?"
-            ],
-            'thanks': [
-                "You're welcome! Happy to help anytime.",
-                "Glad I could assist! Feel free to ask if you need anything else.",
-                "My pleasure! That's what I'm here for.",
-                "No problem at all! Always ready to help.",
-                "It was my pleasure helping you!"
-            ],
-            'goodbye': [
-                "Goodbye! Have a wonderful day!",
-                "See you later! Take care!",
-                "Until next time! Stay well!",
-                "Farewell! Hope to chat again soon!",
-                "Goodbye! Wishing you all the best!"
-            ],
-            'learning': [
-                "I'm learning from our conversation. This helps me provide better responses.",
-                "Thank you for teaching me something new. I'll remember this.",
-                "This is valuable information that I'll incorporate into my knowledge.",
-                "I appreciate the feedback - it helps me improve my responses.",
-                "Each conversation helps me become more helpful. Thank you!"
+    # Learned patterns are matched by concept overlap
+    stores_concepts = True
+    
+    # Precompiled input processing patterns
+    NUMBER_PATTERN = re.compile(r'-?\d+\.?\d*')
+    WORD_PATTERN = re.compile(r'\b[a-zA-Z]+\b')
+    WHITESPACE_PATTERN = re.compile(r'\s+')
+    REPEATED_EXCLAMATION_PATTERN = re.compile(r'[!]{2,}')
+    REPEATED_QUESTION_PATTERN = re.compile(r'[?]{2,}')
+    REPEATED_PERIOD_PATTERN = re.compile(r'[.]{2,}')
+    SPECIAL_CHARACTER_PATTERN = re.compile(r'[^\w\s\?\!\.\,\-\+\*\/\=\(\)]')
+    
+    # A streamed chunk is one word and the whitespace after it
+    STREAM_CHUNK_PATTERN = re.compile(r'\s*\S+\s*|\s+')
+    
+    # The tables below are built once at import and shared read-only by all instances
+    
+    # Expanded stop words for concept extraction
+    STOP_WORDS = frozenset({
+        'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
+        'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the',
+        'to', 'was', 'were', 'will', 'with', 'this', 'but', 'they',
+        'have', 'had', 'what', 'said', 'each', 'which', 'their', 'time',
+        'can', 'could', 'would', 'should', 'may', 'might', 'must',
+        'do', 'does', 'did', 'get', 'got', 'go', 'went', 'come', 'came',
+        'see', 'saw', 'look', 'make', 'made', 'take', 'took', 'give', 'gave'
+    })
+    
+    # Enhanced response templates
+    response_templates = freeze_table({
+        'greeting': [
+            "Hello! How can I assist you today?",
+            "Hi there! What would you like to know or discuss?",
+            "Good day! I'm here to help with any questions or tasks.",
+            "Welcome! How may I be of service?",
+            "Greetings! What can I help you with?"
+        ],
+        'question': [
+            "That's an interesting question. Based on my analysis, {}",
+            "Let me think about this carefully. I believe {}",
+            "From what I understand, {} seems to be the most likely answer.",
+            "After considering the factors, {}",
+            "This is a good question. My reasoning suggests that {}"
+        ],
+        'calculation': [
+            "Let me calculate that for you: {}",
+            "Based on my calculations: {}",
+            "The mathematical result is: {}",
+            "After computing this: {}",
+            "The answer to your calculation is: {}"
+        ],
+        'analysis': [
+            "After analyzing the information: {}",
+            "My detailed analysis shows: {}",
+            "Breaking this down systematically: {}",
+            "Based on the data patterns: {}",
+            "From a logical perspective: {}"
+        ],
+        'unknown': [
+            "I'm not entirely sure about that. Could you provide more context?",
+            "That's interesting, but I need more information to give you a proper answer.",
+            "I'd like to help, but could you clarify what you're asking?",
+            "That's outside my current knowledge. Can you explain it differently?",
+            "I'm still learning about that topic. Could you be more specific?"
+        ],
+        'thanks': [
+            "You're welcome! Happy to help anytime.",
+            "Glad I could assist! Feel free to ask if you need anything else.",
+            "My pleasure! That's what I'm here for.",
+            "No problem at all! Always ready to help.",
+            "It was my pleasure helping you!"
+        ],
+        'goodbye': [
+            "Goodbye! Have a wonderful day!",
+            "See you later! Take care!",
+            "Until next time! Stay well!",
+            "Farewell! Hope to chat again soon!",
+            "Goodbye! Wishing you all the best!"
+        ],
+        'learning': [
+            "I'm learning from our conversation. This helps me provide better responses.",
+            "Thank you for teaching me something new. I'll remember this.",
+            "This is valuable information that I'll incorporate into my knowledge.",
+            "I appreciate the feedback - it helps me improve my responses.",
+            "Each conversation helps me become more helpful. Thank you!"
+        ]
+    })
+    
+    # Enhanced pattern recognition
+    patterns = freeze_table({
+        'greeting': ['hello', 'hi', 'hey', 'good morning', 'good afternoon', 'good evening', 'greetings'],
+        'question': ['?', 'what', 'how', 'when', 'where', 'why', 'who', 'which', 'can you', 'do you', 'are you'],
+        'calculation': ['calculate', 'compute', 'math', 'add', 'subtract', 'multiply', 'divide', 'plus', 'minus', 'times', 'divided by', '=', '+', '-', '*', '/', 'sum', 'total', 'average', 'percentage'],
+        'analysis': ['analyze', 'compare', 'evaluate', 'assess', 'examine', 'review', 'consider', 'think about'],
+        'thanks': ['thank you', 'thanks', 'appreciate', 'grateful', 'much appreciated'],
+        'goodbye': ['goodbye', 'bye', 'see you', 'farewell', 'until next time', 'take care'],
+        'learning': ['learn', 'teach', 'remember', 'understand', 'know', 'explain', 'show me']
+    })
+    
+    # Mathematical operations support
+    math_operations = freeze_table({
+        'add': lambda x, y: x + y,
+        'subtract': lambda x, y: x - y,
+        'multiply': lambda x, y: x * y,
+        'divide': lambda x, y: x / y if y != 0 else "Cannot divide by zero",
+        'power': lambda x, y: x ** y,
+        'sqrt': lambda x: math.sqrt(x) if x >= 0 else "Cannot compute square root of negative number",
+        'factorial': lambda x: math.factorial(int(x)) if x >= 0 and x == int(x) else "Factorial only works with non-negative integers"
+    })
+    
+    # Enhanced knowledge base with deeper reasoning
+    knowledge_domains = freeze_table({
+        'science': {
+            'keywords': ['physics', 'chemistry', 'biology', 'astronomy', 'geology', 'atom', 'molecule', 'cell', 'DNA', 'evolution', 'gravity', 'energy'],
+            'reasoning': 'Scientific topics require logical analysis and evidence-based thinking',
+            'responses': [
+                "From a scientific perspective, this involves fundamental principles of {}",
+                "The scientific method suggests we should examine {} systematically",
+                "This relates to scientific concepts involving {}"
+            ]
+        },
+        'technology': {
+            'keywords': ['computer', 'programming', 'software', 'hardware', 'internet', 'ai', 'machine learning', 'algorithm', 'data', 'code', 'digital'],
+            'reasoning': 'Technology topics involve logical systems and problem-solving approaches',
+            'responses': [
+                "In technological terms, {} represents a systematic approach to problem-solving",
+                "From a computational perspective, {} involves logical processes",
+                "This technology concept relates to {}"
+            ]
+        },
+        'mathematics': {
+            'keywords': ['algebra', 'geometry', 'calculus', 'statistics', 'probability', 'equation', 'formula', 'number', 'calculate'],
+            'reasoning': 'Mathematical concepts follow logical rules and patterns',
+            'responses': [
+                "Mathematically speaking, {} follows logical patterns and rules",
+                "The mathematical approach to {} involves systematic reasoning",
+                "From a mathematical standpoint, {} can be analyzed logically"
+            ]
+        },
+        'philosophy': {
+            'keywords': ['think', 'meaning', 'purpose', 'existence', 'consciousness', 'mind', 'reality', 'truth', 'ethics', 'morality'],
+            'reasoning': 'Philosophical questions require deep contemplation and multiple perspectives',
+            'responses': [
+                "This philosophical question about {} invites deep contemplation",
+                "From a philosophical perspective, {} raises interesting questions about existence and meaning",
+                "The philosophical implications of {} touch on fundamental questions"
+            ]
+        },
+        'psychology': {
+            'keywords': ['behavior', 'emotion', 'feeling', 'memory', 'learning', 'personality', 'motivation', 'stress', 'happiness'],
+            'reasoning': 'Human psychology involves complex patterns of thought and behavior',
+            'responses': [
+                "From a psychological perspective, {} relates to human behavior and cognition",
+                "This touches on psychological concepts involving {}",
+                "The psychological aspects of {} involve complex mental processes"
             ]
         }
-        
-        # Enhanced pattern recognition
-        self.patterns = {
-            'greeting': ['hello', 'hi', 'hey', 'good morning', 'good afternoon', 'good evening', 'greetings'],
-            'question': ['?', 'what', 'how', 'when', 'where', 'why', 'who', 'which', 'can you', 'do you', 'are you'],
-            'calculation': ['calculate', 'compute', 'math', 'add', 'subtract', 'multiply', 'divide', 'plus', 'minus', 'times', 'divided by', '=', '+', '-', '*', '/', 'sum', 'total', 'average', 'percentage'],
-            'analysis': ['analyze', 'compare', 'evaluate', 'assess', 'examine', 'review', 'consider', 'think about'],
-            'thanks': ['thank you', 'thanks', 'appreciate', 'grateful', 'much appreciated'],
-            'goodbye': ['goodbye', 'bye', 'see you', 'farewell', 'until next time', 'take care'],
-            'learning': ['learn', 'teach', 'remember', 'understand', 'know', 'explain', 'show me']
-        }
-        
-        # Mathematical operations support
-        self.math_operations = {
-            'add': lambda x, y: x + y,
-            'subtract': lambda x, y: x - y,
-            'multiply': lambda x, y: x * y,
-            'divide': lambda x, y: x / y if y != 0 else "Cannot divide by zero",
-            'power': lambda x, y: x ** y,
-            'sqrt': lambda x: math.sqrt(x) if x >= 0 else "Cannot compute square root of negative number",
-            'factorial': lambda x: math.factorial(int(x)) if x >= 0 and x == int(x) else "Factorial only works with non-negative integers"
-        }
-        
-        # Enhanced knowledge base with deeper reasoning
-        self.knowledge_domains = {
-            'science': {
-                'keywords': ['physics', 'chemistry', 'biology', 'astronomy', 'geology', 'atom', 'molecule', 'cell', 'DNA', 'evolution', 'gravity', 'energy'],
-                'reasoning': 'Scientific topics require logical analysis and evidence-based thinking',
-                'responses': [
-                    "From a scientific perspective, this involves fundamental principles of {}",
-                    "The scientific method suggests we should examine {} systematically",
-                    "This relates to scientific concepts involving {}"
-                ]
-            },
-            'technology': {
-                'keywords': ['computer', 'programming', 'software', 'hardware', 'internet', 'ai', 'machine learning', 'algorithm', 'data', 'code', 'digital'],
-                'reasoning': 'Technology topics involve logical systems and problem-solving approaches',
-                'responses': [
-                    "In technological terms, {} represents a systematic approach to problem-solving",
-                    "From a computational perspective, {} involves logical processes",
-                    "This technology concept relates to {}"
-                ]
-            },
-            'mathematics': {
-                'keywords': ['algebra', 'geometry', 'calculus', 'statistics', 'probability', 'equation', 'formula', 'number', 'calculate'],
-                'reasoning': 'Mathematical concepts follow logical rules and patterns',
-                'responses': [
-                    "Mathematically speaking, {} follows logical patterns and rules",
-                    "The mathematical approach to {} involves systematic reasoning",
-                    "From a mathematical standpoint, {} can be analyzed logically"
-                ]
-            },
-            'philosophy': {
-                'keywords': ['think', 'meaning', 'purpose', 'existence', 'consciousness', 'mind', 'reality', 'truth', 'ethics', 'morality'],
-                'reasoning': 'Philosophical questions require deep contemplation and multiple perspectives',
-                'responses': [
-                    "This philosophical question about {} invites deep contemplation",
-                    "From a philosophical perspective, {} raises interesting questions about existence and meaning",
-                    "The philosophical implications of {} touch on fundamental questions"
-                ]
-            },
-            'psychology': {
-                'keywords': ['behavior', 'emotion', 'feeling', 'memory', 'learning', 'personality', 'motivation', 'stress', 'happiness'],
-                'reasoning': 'Human psychology involves complex patterns of thought and behavior',
-                'responses': [
-                    "From a psychological perspective, {} relates to human behavior and cognition",
-                    "This touches on psychological concepts involving {}",
-                    "The psychological aspects of {} involve complex mental processes"
-                ]
-            }
-        }
-        
-        # Reasoning patterns for AI-like responses
-        self.reasoning_patterns = {
-            'cause_effect': ['because', 'since', 'therefore', 'as a result', 'consequently'],
-            'comparison': ['similar to', 'different from', 'like', 'unlike', 'compared to'],
-            'analysis': ['analyzing', 'examining', 'considering', 'evaluating', 'breaking down'],
-            'synthesis': ['combining', 'integrating', 'merging', 'connecting', 'relating'],
-            'hypothesis': ['possibly', 'might be', 'could be', 'perhaps', 'potentially']
-        }
-        
-        # Memory for conversation context and personality
-        self.conversation_memory = {
+    })
+    
+    # Reasoning patterns for AI-like responses
+    reasoning_patterns = freeze_table({
+        'cause_effect': ['because', 'since', 'therefore', 'as a result', 'consequently'],
+        'comparison': ['similar to', 'different from', 'like', 'unlike', 'compared to'],
+        'analysis': ['analyzing', 'examining', 'considering', 'evaluating', 'breaking down'],
+        'synthesis': ['combining', 'integrating', 'merging', 'connecting', 'relating'],
+        'hypothesis': ['possibly', 'might be', 'could be', 'perhaps', 'potentially']
+    })
+    
+    # Fallback reasoning for inputs matching no reasoning pattern
+    reasoning_fallbacks = freeze_table({
+        'cause_effect': ['why', 'how', 'what if'],
+        'comparison': ['compare', 'versus', 'difference']
+    })
+    
+    def new_session_state(self) -> Dict[str, Any]:
+        """Create the conversation memory and personality for a new session"""
+        return {
             'user_preferences': {},
             'discussed_topics': [],
             'personality_traits': ['curious', 'analytical', 'helpful', 'thoughtful'],
             'reasoning_style': 'logical_and_intuitive'
         }
     
+    @property
+    def conversation_memory(self) -> Dict[str, Any]:
+        """Memory for conversation context and personality of the session being served"""
+        return self.session_state
+    
     def generate_response(self, user_input: str, chat_history: List[Dict]) -> str:
         """Generate AI-like response using sophisticated local reasoning"""
         
+        # Clean, tokenize and classify the input once for the whole turn
+        return self.respond_to_analysis(self.analyze_input(user_input), chat_history)
+    
+    def generate_responses(self, inputs: List[str], histories: List[List[Dict]]) -> List[str]:
+        """Generate responses to a batch of inputs, analyzing them all before answering any"""
+        # Analysis does not depend on conversation memory or learning data
+        analyses = [self.analyze_input(user_input) for user_input in inputs]
+        
+        responses = []
+        for start in range(0, len(analyses), self.batch_commit_size):
+            end = start + self.batch_commit_size
+            with self.batch():
+                responses += [self.respond_to_analysis(analysis, chat_history)
+                              for analysis, chat_history in zip(analyses[start:end], histories[start:end])]
+        return responses
+    
+    def respond_to_analysis(self, analysis: AnalyzedInput, chat_history: List[Dict]) -> str:
+        """Generate a response to an already analyzed input"""
+        return ''.join(self.stream_analysis_response(analysis, chat_history))
+    
+    def generate_response_stream(self, user_input: str, chat_history: List[Dict]) -> Iterator[str]:
+        """Stream the response word by word as each part is composed"""
+        with closing(self.stream_analysis_response(self.analyze_input(user_input), chat_history)) as parts:
+            for part in parts:
+                yield from self.STREAM_CHUNK_PATTERN.findall(part)
+    
+    def stream_analysis_response(self, analysis: AnalyzedInput, chat_history: List[Dict]) -> Iterator[str]:
+        """Yield the parts of a response to an analyzed input as they are composed, then learn from it"""
+        user_input = analysis.original
+        
         # Update conversation memory
-        self.update_conversation_context(user_input, chat_history)
+        self.update_conversation_context(user_input, chat_history, analysis)
         
         # First, try advanced learned response matching
-        learned_response = self.find_intelligent_learned_response(user_input)
+        learned_response = self.find_intelligent_learned_response(user_input, analysis)
         if learned_response:
-            return self.add_reasoning_layer(learned_response, user_input)
+            yield self.add_reasoning_layer(learned_response, user_input)
+            return
         
-        # Clean and analyze input with AI-like preprocessing
-        clean_input = self.clean_input(user_input)
+        clean_input = analysis.clean
         
         # Check for mathematical calculations with reasoning
-        calc_result = self.try_calculate(clean_input)
+        calc_result = self.try_calculate(clean_input, analysis)
         if calc_result:
             reasoning = self.generate_calculation_reasoning(user_input, calc_result)
-            response = f"{reasoning} {calc_result}"
-            self.learn_from_conversation(user_input, response, confidence=0.95)
-            return response
+            yield from self.stream_and_learn(user_input, iter((f"{reasoning} ", calc_result)), 0.95)
+            return
         
-        # Multi-layer intent detection with reasoning
-        primary_intent = self.detect_intent(clean_input)
-        reasoning_type = self.detect_reasoning_pattern(clean_input)
-        domain = self.identify_advanced_domain(clean_input)
-        
-        # Generate AI-like response with multi-layer reasoning
-        response = self.generate_ai_like_response(
-            primary_intent, reasoning_type, domain, clean_input, chat_history, user_input
-        )
+        # Multi-layer intent detection with reasoning, from one keyword scan
+        primary_intent = self.detect_intent(clean_input, analysis.hits)
+        reasoning_type = self.detect_reasoning_pattern(clean_input, analysis.hits)
+        domain = self.identify_advanced_domain(clean_input, analysis.hits)
         
         # Advanced learning with contextual confidence
         confidence = self.calculate_advanced_confidence(
-            primary_intent, reasoning_type, domain, clean_input, chat_history
+            primary_intent, reasoning_type, domain, clean_input, chat_history, analysis
         )
-        self.learn_from_conversation(user_input, response, confidence=confidence)
         
-        return response
+        # Generate AI-like response with multi-layer reasoning
+        parts = self.stream_ai_like_response(
+            primary_intent, reasoning_type, domain, clean_input, chat_history, user_input, analysis
+        )
+        yield from self.stream_and_learn(user_input, parts, confidence)
+    
+    def stream_and_learn(self, user_input: str, parts: Iterator[str], confidence: float) -> Iterator[str]:
+        """Yield response parts, then learn from the whole response even if the reader stops early"""
+        composed = []
+        try:
+            for part in parts:
+                composed.append(part)
+                yield part
+        except GeneratorExit:
+            # Finish composing the abandoned response so the turn is still learned
+            composed.extend(parts)
+            self.learn_from_conversation(user_input, ''.join(composed), confidence=confidence)
+            raise
+        
+        self.learn_from_conversation(user_input, ''.join(composed), confidence=confidence)
+    
+    def analyze_input(self, user_input: str) -> AnalyzedInput:
+        """Clean, tokenize and classify user input for one turn"""
+        clean = self.clean_input(user_input)
+        return AnalyzedInput(
+            original=user_input,
+            clean=clean,
+            concepts=self.extract_enhanced_concepts(user_input),
+            clean_concepts=self.extract_enhanced_concepts(clean),
+            numbers=self.NUMBER_PATTERN.findall(clean),
+            hits=self.find_keywords(clean)
+        )
     
-    def try_calculate(self, text: str) -> str:
+    def try_calculate(self, text: str, analysis: Optional[AnalyzedInput] = None) -> str:
         """Try to perform mathematical calculations"""
         # Extract numbers and operations
-        numbers = re.findall(r'-?\d+\.?\d*', text)
+        numbers = analysis.numbers if analysis else self.NUMBER_PATTERN.findall(text)
         
         # Need at least one or two numbers depending on operation
         if len(numbers) < 1:
@@ -223,7 +345,7 @@ class AIModule(BaseAIModule):
             nums = [float(n) for n in numbers]
             
             # Check for specific calculation patterns
-            text_lower = text.lower()
+            text_lower = analysis.clean if analysis else text.lower()
             
             # Addition
             if any(op in text_lower for op in ['plus', '+', 'add']) and len(nums) >= 2:
@@ -296,22 +418,49 @@ class AIModule(BaseAIModule):
                         return f"{numbers[0]} ÷ {numbers[1]} = {result:.4f}"
                     else:
                         return "Cannot divide by zero"
-            
+        
         except (ValueError, OverflowError) as e:
             return f"Calculation error: {str(e)}"
         
         return ""
     
-    def detect_intent(self, text: str) -> str:
+    @classmethod
+    def build_keyword_matcher(cls) -> KeywordMatcher:
+        """Compile the intent, domain and reasoning keyword tables into one matcher"""
+        keywords = []
+        
+        for intent_keywords in cls.patterns.values():
+            keywords.extend(intent_keywords)
+        
+        for info in cls.knowledge_domains.values():
+            keywords.extend(info['keywords'])
+            # detect_intent's domain fallback tests the domain entry's own keys
+            keywords.extend(info)
+        
+        for reasoning_keywords in cls.reasoning_patterns.values():
+            keywords.extend(reasoning_keywords)
+        
+        for fallback_keywords in cls.reasoning_fallbacks.values():
+            keywords.extend(fallback_keywords)
+        
+        keywords.append('?')
+        return KeywordMatcher(keywords)
+    
+    def find_keywords(self, text: str) -> Set[str]:
+        """Find every known keyword occurring in the lowercased text"""
+        return self.keyword_matcher.find(text.lower())
+    
+    def detect_intent(self, text: str, hits: Optional[Set[str]] = None) -> str:
         """Enhanced intent detection with weighted scoring"""
-        text_lower = text.lower()
+        if hits is None:
+            hits = self.find_keywords(text)
         intent_scores = {}
         
         # Score each intent based on keyword matches
         for intent, keywords in self.patterns.items():
             score = 0
             for keyword in keywords:
-                if keyword in text_lower:
+                if keyword in hits:
                     # Weight longer keywords more heavily
                     score += len(keyword.split())
             intent_scores[intent] = score
@@ -329,7 +478,7 @@ class AIModule(BaseAIModule):
         
         # Check for domain-specific questions
         for domain, terms in self.knowledge_domains.items():
-            if any(term in text_lower for term in terms):
+            if any(term in hits for term in terms):
                 return 'analysis'
         
         return 'unknown'
@@ -434,20 +583,10 @@ class AIModule(BaseAIModule):
     
     def extract_enhanced_concepts(self, text: str) -> List[str]:
         """Enhanced concept extraction with better filtering"""
-        
-        # Expanded stop words
-        stop_words = {
-            'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
-            'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the',
-            'to', 'was', 'were', 'will', 'with', 'this', 'but', 'they',
-            'have', 'had', 'what', 'said', 'each', 'which', 'their', 'time',
-            'can', 'could', 'would', 'should', 'may', 'might', 'must',
-            'do', 'does', 'did', 'get', 'got', 'go', 'went', 'come', 'came',
-            'see', 'saw', 'look', 'make', 'made', 'take', 'took', 'give', 'gave'
-        }
+        stop_words = self.STOP_WORDS
         
         # Extract words and phrases
-        words = re.findall(r'\b[a-zA-Z]+\b', text.lower())
+        words = self.WORD_PATTERN.findall(text.lower())
         concepts = []
         
         # Single words
@@ -465,6 +604,10 @@ class AIModule(BaseAIModule):
         concepts = list(set(concepts))
         return concepts[:8]
     
+    def extract_pattern_concepts(self, pattern: str) -> List[str]:
+        """Extract the concepts stored for a learned pattern"""
+        return self.extract_enhanced_concepts(pattern)
+    
     def identify_knowledge_domain(self, concepts: List[str]) -> str:
         """Identify the knowledge domain of the concepts"""
         
@@ -626,15 +769,15 @@ class AIModule(BaseAIModule):
         text = text.lower().strip()
         
         # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = self.WHITESPACE_PATTERN.sub(' ', text)
         
         # Remove excessive punctuation but keep meaningful ones
-        text = re.sub(r'[!]{2,}', '!', text)
-        text = re.sub(r'[?]{2,}', '?', text)
-        text = re.sub(r'[.]{2,}', '.', text)
+        text = self.REPEATED_EXCLAMATION_PATTERN.sub('!', text)
+        text = self.REPEATED_QUESTION_PATTERN.sub('?', text)
+        text = self.REPEATED_PERIOD_PATTERN.sub('.', text)
         
         # Remove special characters but keep alphanumeric, spaces, and basic punctuation
-        text = re.sub(r'[^\w\s\?\!\.\,\-\+\*\/\=\(\)]', '', text)
+        text = self.SPECIAL_CHARACTER_PATTERN.sub('', text)
         
         return text.strip()
     
@@ -643,15 +786,9 @@ class AIModule(BaseAIModule):
         base_stats = super().get_stats()
         
         # Add A.v.A specific enhanced stats
-        learning_data = self.chat_manager.get_learning_data(self.module_name)
-        
-        avg_confidence = 0.0
-        active_patterns = 0
-        
-        if learning_data:
-            confidences = [data['confidence'] for data in learning_data]
-            avg_confidence = statistics.mean(confidences) if confidences else 0.0
-            active_patterns = len([data for data in learning_data if data['usage_count'] > 0])
+        learning_summary = self.chat_manager.get_learning_summary(self.module_name)
+        avg_confidence = learning_summary['avg_confidence']
+        active_patterns = learning_summary['active_patterns']
         
         base_stats.update({
             'response_templates': sum(len(templates) for templates in self.response_templates.values()),
@@ -663,16 +800,18 @@ class AIModule(BaseAIModule):
             'reasoning_patterns': len(self.reasoning_patterns),
             'personality_traits': len(self.conversation_memory['personality_traits']),
             'discussed_topics': len(set(self.conversation_memory.get('discussed_topics', []))),
+            'active_sessions': len(self.sessions),
             'module_type': 'AI-like Local Intelligence',
             'capabilities': 'Advanced Reasoning, Context Awareness, Adaptive Learning, Multi-domain Analysis'
         })
         
         return base_stats
     
-    def update_conversation_context(self, user_input: str, chat_history: List[Dict]):
+    def update_conversation_context(self, user_input: str, chat_history: List[Dict],
+                                    analysis: Optional[AnalyzedInput] = None):
         """Update conversation memory with AI-like context awareness"""
         # Extract topics from current input
-        concepts = self.extract_enhanced_concepts(user_input)
+        concepts = analysis.concepts if analysis else self.extract_enhanced_concepts(user_input)
         self.conversation_memory['discussed_topics'].extend(concepts[:3])
         
         # Keep only recent topics (last 20)
@@ -680,37 +819,23 @@ class AIModule(BaseAIModule):
             self.conversation_memory['discussed_topics'] = self.conversation_memory['discussed_topics'][-20:]
         
         # Analyze user communication patterns
-        if len(user_input.split()) > 10:
+        word_count = len(analysis.words) if analysis else len(user_input.split())
+        if word_count > 10:
             self.conversation_memory['user_preferences']['detail_level'] = 'detailed'
-        elif len(user_input.split()) < 3:
+        elif word_count < 3:
             self.conversation_memory['user_preferences']['detail_level'] = 'brief'
     
-    def find_intelligent_learned_response(self, user_input: str) -> str:
+    def find_intelligent_learned_response(self, user_input: str, analysis: Optional[AnalyzedInput] = None) -> str:
         """Advanced learned response matching with semantic understanding"""
-        learning_data = self.chat_manager.get_learning_data(self.module_name)
-        
-        if not learning_data:
-            return ""
-        
-        user_concepts = set(self.extract_enhanced_concepts(user_input))
-        best_match = None
-        best_score = 0
+        user_concepts = set(analysis.concepts if analysis else self.extract_enhanced_concepts(user_input))
         
-        for data in learning_data:
-            pattern_concepts = set(self.extract_enhanced_concepts(data['pattern']))
-            
-            # Semantic similarity scoring
-            concept_overlap = len(user_concepts.intersection(pattern_concepts))
-            confidence_bonus = data['confidence'] * 2
-            usage_bonus = min(data['usage_count'] * 0.5, 3)
-            
-            score = concept_overlap + confidence_bonus + usage_bonus
-            
-            if score > best_score and score > 4:  # Higher threshold for quality
-                best_score = score
-                best_match = data
+        # Scoring and ranking run in SQLite over stored pattern concepts;
+        # score = concept overlap + confidence * 2 + min(usage * 0.5, 3)
+        matches = self.chat_manager.rank_learned_responses(
+            self.module_name, user_concepts, min_score=4, limit=1  # Higher threshold for quality
+        )
         
-        return best_match['response'] if best_match else ""
+        return matches[0]['response'] if matches else ""
     
     def add_reasoning_layer(self, base_response: str, user_input: str) -> str:
         """Add AI-like reasoning to learned responses"""
@@ -735,33 +860,35 @@ class AIModule(BaseAIModule):
         ]
         return random.choice(reasoning_options)
     
-    def detect_reasoning_pattern(self, text: str) -> str:
+    def detect_reasoning_pattern(self, text: str, hits: Optional[Set[str]] = None) -> str:
         """Detect the type of reasoning needed"""
-        text_lower = text.lower()
+        if hits is None:
+            hits = self.find_keywords(text)
         
         for pattern_type, keywords in self.reasoning_patterns.items():
-            if any(keyword in text_lower for keyword in keywords):
+            if any(keyword in hits for keyword in keywords):
                 return pattern_type
         
         # Default reasoning based on question type
-        if '?' in text:
+        if '?' in hits:
             return 'analysis'
-        elif any(word in text_lower for word in ['why', 'how', 'what if']):
-            return 'cause_effect'
-        elif any(word in text_lower for word in ['compare', 'versus', 'difference']):
-            return 'comparison'
-        else:
-            return 'synthesis'
+        
+        for pattern_type, words in self.reasoning_fallbacks.items():
+            if any(word in hits for word in words):
+                return pattern_type
+        
+        return 'synthesis'
     
-    def identify_advanced_domain(self, text: str) -> str:
+    def identify_advanced_domain(self, text: str, hits: Optional[Set[str]] = None) -> str:
         """Advanced domain identification with confidence scoring"""
-        text_lower = text.lower()
+        if hits is None:
+            hits = self.find_keywords(text)
         domain_scores = {}
         
         for domain, info in self.knowledge_domains.items():
             score = 0
             for keyword in info['keywords']:
-                if keyword in text_lower:
+                if keyword in hits:
                     # Weight longer, more specific keywords higher
                     score += len(keyword.split()) + 1
             domain_scores[domain] = score
@@ -780,35 +907,44 @@ class AIModule(BaseAIModule):
         return ""
     
     def generate_ai_like_response(self, intent: str, reasoning_type: str, domain: str, 
-                                clean_input: str, chat_history: List[Dict], original_input: str) -> str:
+                                clean_input: str, chat_history: List[Dict], original_input: str,
+                                analysis: Optional[AnalyzedInput] = None) -> str:
         """Generate sophisticated AI-like responses with multi-layer reasoning"""
+        return ''.join(self.stream_ai_like_response(
+            intent, reasoning_type, domain, clean_input, chat_history, original_input, analysis
+        ))
+    
+    def stream_ai_like_response(self, intent: str, reasoning_type: str, domain: str,
+                                clean_input: str, chat_history: List[Dict], original_input: str,
+                                analysis: Optional[AnalyzedInput] = None) -> Iterator[str]:
+        """Yield the parts of an AI-like response as each is composed"""
         
         # Handle identity with AI personality
         if intent == 'greeting':
-            return self.generate_personalized_greeting(chat_history)
+            yield self.generate_personalized_greeting(chat_history)
         
         elif intent == 'question':
-            return self.generate_reasoning_based_response(
-                clean_input, reasoning_type, domain, chat_history, original_input
+            yield from self.stream_reasoning_based_response(
+                clean_input, reasoning_type, domain, chat_history, original_input, analysis
             )
         
         elif intent == 'analysis':
-            return self.generate_analytical_response(
-                clean_input, reasoning_type, domain, chat_history
+            yield from self.stream_analytical_response(
+                clean_input, reasoning_type, domain, chat_history, analysis
             )
         
         elif intent == 'thanks':
-            return self.generate_contextual_thanks_response(chat_history)
+            yield self.generate_contextual_thanks_response(chat_history)
         
         elif intent == 'goodbye':
-            return self.generate_thoughtful_goodbye(chat_history)
+            yield self.generate_thoughtful_goodbye(chat_history)
         
         elif intent == 'learning':
-            return self.generate_learning_response(clean_input, chat_history)
+            yield self.generate_learning_response(clean_input, chat_history)
         
         else:
-            return self.generate_intelligent_unknown_response(
-                clean_input, reasoning_type, domain, chat_history
+            yield self.generate_intelligent_unknown_response(
+                clean_input, reasoning_type, domain, chat_history, analysis
             )
     
     def generate_personalized_greeting(self, chat_history: List[Dict]) -> str:
@@ -828,34 +964,48 @@ class AIModule(BaseAIModule):
                 return "Good to see you again! I'm here and ready to assist with whatever you need."
     
     def generate_reasoning_based_response(self, clean_input: str, reasoning_type: str, 
-                                        domain: str, chat_history: List[Dict], original_input: str) -> str:
+                                        domain: str, chat_history: List[Dict], original_input: str,
+                                        analysis: Optional[AnalyzedInput] = None) -> str:
         """Generate responses with explicit reasoning chains"""
+        return ''.join(self.stream_reasoning_based_response(
+            clean_input, reasoning_type, domain, chat_history, original_input, analysis
+        ))
+    
+    def stream_reasoning_based_response(self, clean_input: str, reasoning_type: str,
+                                        domain: str, chat_history: List[Dict], original_input: str,
+                                        analysis: Optional[AnalyzedInput] = None) -> Iterator[str]:
+        """Yield a reasoning-chain response part by part: reasoning, template, then deeper analysis"""
+        clean_lower = analysis.clean if analysis else clean_input.lower()
+        concepts = analysis.clean_concepts if analysis else self.extract_enhanced_concepts(clean_input)
         
         # Handle specific question types with AI-like analysis
-        if 'who are you' in clean_input.lower() or 'what are you' in clean_input.lower():
-            return "I'm A.v.A - an Advanced virtual Assistant. I'm designed to think, reason, and learn from our conversations. Unlike simple chatbots, I can perform calculations, analyze information, and adapt my responses based on context. I operate entirely locally without external APIs, using sophisticated reasoning algorithms."
+        if 'who are you' in clean_lower or 'what are you' in clean_lower:
+            yield "I'm A.v.A - an Advanced virtual Assistant. I'm designed to think, reason, and learn from our conversations. Unlike simple chatbots, I can perform calculations, analyze information, and adapt my responses based on context. I operate entirely locally without external APIs, using sophisticated reasoning algorithms."
+            return
         
-        if 'how do you work' in clean_input.lower():
-            return "I use multiple layers of analysis: pattern recognition for understanding context, semantic analysis for meaning extraction, reasoning pattern detection for logical flow, and adaptive learning from our conversations. My responses combine logical reasoning with intuitive understanding, much like human thought processes."
+        if 'how do you work' in clean_lower:
+            yield "I use multiple layers of analysis: pattern recognition for understanding context, semantic analysis for meaning extraction, reasoning pattern detection for logical flow, and adaptive learning from our conversations. My responses combine logical reasoning with intuitive understanding, much like human thought processes."
+            return
         
         # Domain-specific reasoning
         if domain and domain in self.knowledge_domains:
             domain_info = self.knowledge_domains[domain]
-            concepts = self.extract_enhanced_concepts(clean_input)
             
             if concepts:
-                reasoning_text = domain_info['reasoning']
+                yield f"{domain_info['reasoning']}. "
                 response_template = random.choice(domain_info['responses'])
                 concept_text = ', '.join(concepts[:3])
-                
-                return f"{reasoning_text}. {response_template.format(concept_text)}. Let me analyze this further: {self.generate_deeper_analysis(concepts, reasoning_type)}"
+                yield f"{response_template.format(concept_text)}. "
+                yield f"Let me analyze this further: {self.generate_deeper_analysis(concepts, reasoning_type)}"
+                return
         
         # General reasoning-based response
-        concepts = self.extract_enhanced_concepts(clean_input)
         if concepts:
-            return f"Analyzing your question about {concepts[0]}, I need to consider multiple factors. {self.generate_contextual_reasoning(concepts, reasoning_type, chat_history)}"
+            yield f"Analyzing your question about {concepts[0]}, I need to consider multiple factors. "
+            yield self.generate_contextual_reasoning(concepts, reasoning_type, chat_history)
+            return
         
-        return "That's an intriguing question that requires careful analysis. Could you provide more context so I can apply the appropriate reasoning approach?"
+        yield "That's an intriguing question that requires careful analysis. Could you provide more context so I can apply the appropriate reasoning approach?"
     
     def generate_deeper_analysis(self, concepts: List[str], reasoning_type: str) -> str:
         """Generate deeper analytical insights"""
@@ -875,23 +1025,31 @@ class AIModule(BaseAIModule):
         else:
             return f"To properly address {concepts[0]}, I need to apply {reasoning_type} reasoning and consider various perspectives."
     
-    def generate_analytical_response(self, clean_input: str, reasoning_type: str, domain: str, chat_history: List[Dict]) -> str:
+    def generate_analytical_response(self, clean_input: str, reasoning_type: str, domain: str, chat_history: List[Dict],
+                                     analysis: Optional[AnalyzedInput] = None) -> str:
         """Generate analytical responses with AI-like depth"""
-        concepts = self.extract_enhanced_concepts(clean_input)
+        return ''.join(self.stream_analytical_response(clean_input, reasoning_type, domain, chat_history, analysis))
+    
+    def stream_analytical_response(self, clean_input: str, reasoning_type: str, domain: str, chat_history: List[Dict],
+                                   analysis: Optional[AnalyzedInput] = None) -> Iterator[str]:
+        """Yield an analytical response part by part: template, then deeper analysis"""
+        concepts = analysis.clean_concepts if analysis else self.extract_enhanced_concepts(clean_input)
         
         if domain and domain in self.knowledge_domains:
             domain_info = self.knowledge_domains[domain]
             response_template = random.choice(domain_info['responses'])
             concept_text = ', '.join(concepts[:2])
             
-            analysis = f"{response_template.format(concept_text)}. "
-            analysis += self.generate_deeper_analysis(concepts, reasoning_type)
-            return analysis
+            yield f"{response_template.format(concept_text)}. "
+            yield self.generate_deeper_analysis(concepts, reasoning_type)
+            return
         
         if concepts:
-            return f"Analyzing {concepts[0]}, I can identify several interconnected factors: {self.generate_deeper_analysis(concepts, reasoning_type)}"
+            yield f"Analyzing {concepts[0]}, I can identify several interconnected factors: "
+            yield self.generate_deeper_analysis(concepts, reasoning_type)
+            return
         
-        return "This requires systematic analysis. Could you provide more specific details for me to examine?"
+        yield "This requires systematic analysis. Could you provide more specific details for me to examine?"
     
     def generate_contextual_thanks_response(self, chat_history: List[Dict]) -> str:
         """Generate contextual thanks responses"""
@@ -919,11 +1077,12 @@ class AIModule(BaseAIModule):
         ]
         return random.choice(learning_responses)
     
-    def generate_intelligent_unknown_response(self, clean_input: str, reasoning_type: str, domain: str, chat_history: List[Dict]) -> str:
+    def generate_intelligent_unknown_response(self, clean_input: str, reasoning_type: str, domain: str, chat_history: List[Dict],
+                                              analysis: Optional[AnalyzedInput] = None) -> str:
         """Generate intelligent responses for unknown inputs with reasoning"""
         
         # Try to identify what the user might be asking about
-        concepts = self.extract_enhanced_concepts(clean_input)
+        concepts = analysis.clean_concepts if analysis else self.extract_enhanced_concepts(clean_input)
         
         if concepts:
             reasoning_approach = "Let me think about this systematically"
@@ -947,7 +1106,8 @@ class AIModule(BaseAIModule):
         return random.choice(uncertainty_responses)
     
     def calculate_advanced_confidence(self, intent: str, reasoning_type: str, domain: str, 
-                                    clean_input: str, chat_history: List[Dict]) -> float:
+                                    clean_input: str, chat_history: List[Dict],
+                                    analysis: Optional[AnalyzedInput] = None) -> float:
         """Calculate confidence with advanced contextual factors"""
         base_confidence = 0.6
         
@@ -973,8 +1133,11 @@ class AIModule(BaseAIModule):
             confidence += 0.05
         
         # Input complexity consideration
-        words = len(clean_input.split())
+        words = len(analysis.clean_words) if analysis else len(clean_input.split())
         if 5 <= words <= 15:  # Optimal complexity
             confidence += 0.05
         
-        return min(confidence, 1.0)
\ No newline at end of file
+        return min(confidence, 1.0)
+
+# One automaton over every keyword table, so classifying an input is a single scan
+AIModule.keyword_matcher = AIModule.build_keyword_matcher()
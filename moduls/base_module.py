@@ -1,11 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from contextlib import contextmanager
+from contextvars import copy_context
+from typing import List, Dict, Any, Iterator, Optional
 from pathlib import Path
 import sys
 
 # Add core to path for imports
 sys.path.append(str(Path(__file__).parent.parent / "core"))
-from chat_manager import ChatManager
+try:
+    # Share the app's ChatManager (and its connection pool) when the project root is importable
+    from core.chat_manager import ChatManager
+    from core.retrieval import RetrievalEngine, BM25Retrieval
+    from core.session_store import SessionStore, current_session_id
+except ImportError:
+    from chat_manager import ChatManager
+    from retrieval import RetrievalEngine, BM25Retrieval
+    from session_store import SessionStore, current_session_id
 
 class BaseAIModule(ABC):
     """Base class for all AI modules"""
@@ -14,30 +24,134 @@ class BaseAIModule(ABC):
     version = "1.0.0"
     description = "Base AI module class"
     
+    # Modules that match on pattern concepts store them at learn time
+    stores_concepts = False
+    
+    # Optional engine replacing find_similar_response's default matching,
+    # e.g. retrieval_engine = BM25Retrieval()
+    retrieval_engine: Optional[RetrievalEngine] = None
+    
+    # Idle sessions beyond this many have their state evicted
+    max_sessions = 256
+    
+    # Inputs of a batch committed per transaction; bounds how long a batch
+    # holds the database's write lock
+    batch_commit_size = 100
+    
     def __init__(self):
         self.chat_manager = ChatManager()
         self.module_name = self.__class__.name
         
+        # Per-session state, so one instance can serve many users
+        self.sessions = SessionStore(self.new_session_state, self.max_sessions)
+        
         # Initialize database for this module
         self.chat_manager.init_module_database(self.module_name)
+        
+        # Extract concepts for patterns learned before concepts were stored
+        if self.stores_concepts:
+            self.chat_manager.index_learning_concepts(self.module_name, self.extract_pattern_concepts)
+        
+        if self.retrieval_engine is not None:
+            self.retrieval_engine.prepare(self.chat_manager, self.module_name)
     
     @abstractmethod
     def generate_response(self, user_input: str, chat_history: List[Dict]) -> str:
         """Generate a response to user input"""
         pass
     
+    def generate_response_stream(self, user_input: str, chat_history: List[Dict]) -> Iterator[str]:
+        """Generate a response in chunks; modules without native streaming yield it whole"""
+        yield self.generate_response(user_input, chat_history)
+    
+    def respond(self, user_input: str, chat_history: List[Dict], session_id: Optional[str] = None) -> str:
+        """Generate a response with session_state bound to the given session"""
+        if session_id is None:
+            return self.generate_response(user_input, chat_history)
+        
+        token = current_session_id.set(session_id)
+        try:
+            return self.generate_response(user_input, chat_history)
+        finally:
+            current_session_id.reset(token)
+    
+    def respond_stream(self, user_input: str, chat_history: List[Dict],
+                       session_id: Optional[str] = None) -> Iterator[str]:
+        """Stream a response with session_state bound to the given session"""
+        stream = self.generate_response_stream(user_input, chat_history)
+        if session_id is None:
+            yield from stream
+            return
+        
+        # The stream resumes in the caller's context after each chunk,
+        # so it runs in a context of its own with the session bound
+        context = copy_context()
+        context.run(current_session_id.set, session_id)
+        try:
+            while True:
+                try:
+                    chunk = context.run(next, stream)
+                except StopIteration:
+                    return
+                yield chunk
+        finally:
+            # A stream closed early finishes its turn with the session still bound
+            context.run(stream.close)
+    
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Run the enclosed turns in one database transaction, committed when the batch ends"""
+        with self.chat_manager.transaction(self.module_name):
+            yield
+    
+    def generate_responses(self, inputs: List[str], histories: List[List[Dict]]) -> List[str]:
+        """Generate responses to a batch of inputs as consecutive turns, committing every batch_commit_size inputs"""
+        responses = []
+        for start in range(0, len(inputs), self.batch_commit_size):
+            end = start + self.batch_commit_size
+            with self.batch():
+                responses += [self.generate_response(user_input, chat_history)
+                              for user_input, chat_history in zip(inputs[start:end], histories[start:end])]
+        return responses
+    
+    def respond_batch(self, inputs: List[str], histories: List[List[Dict]],
+                      session_id: Optional[str] = None) -> List[str]:
+        """Generate a batch of responses with session_state bound to the given session"""
+        if session_id is None:
+            return self.generate_responses(inputs, histories)
+        
+        token = current_session_id.set(session_id)
+        try:
+            return self.generate_responses(inputs, histories)
+        finally:
+            current_session_id.reset(token)
+    
+    def new_session_state(self) -> Dict[str, Any]:
+        """Create the state kept for a new session"""
+        return {}
+    
+    @property
+    def session_state(self) -> Dict[str, Any]:
+        """Get the state of the session being served"""
+        return self.sessions.get()
+    
     def learn_from_conversation(self, user_input: str, ai_response: str, confidence: float = 1.0):
         """Learn from a conversation"""
         # Extract patterns from user input for learning
         patterns = self.extract_patterns(user_input)
         
-        for pattern in patterns:
-            self.chat_manager.save_learning_data(
-                self.module_name, 
-                pattern, 
-                ai_response, 
-                confidence
-            )
+        concepts = None
+        if self.stores_concepts:
+            concepts = [self.extract_pattern_concepts(pattern) for pattern in patterns]
+        
+        # Store all patterns in one transaction
+        self.chat_manager.save_learning_batch(
+            self.module_name,
+            patterns,
+            ai_response,
+            confidence,
+            concepts
+        )
     
     def extract_patterns(self, text: str) -> List[str]:
         """Extract learning patterns from text"""
@@ -61,14 +175,24 @@ class BaseAIModule(ABC):
         
         return patterns
     
+    def extract_pattern_concepts(self, pattern: str) -> List[str]:
+        """Extract the concepts stored for a learned pattern"""
+        return []
+    
     def find_similar_response(self, user_input: str) -> str:
         """Find a similar response from learning data"""
-        learning_data = self.chat_manager.get_learning_data(self.module_name)
+        if self.retrieval_engine is not None:
+            return self.retrieval_engine.find_response(self.chat_manager, self.module_name, user_input)
+        
+        user_input_lower = user_input.lower().strip()
+        
+        # Only patterns that can score against the input are considered
+        index = self.chat_manager.get_learning_index(self.module_name)
+        learning_data = index.candidates(user_input_lower)
         
         if not learning_data:
             return None
         
-        user_input_lower = user_input.lower().strip()
         best_match = None
         best_score = 0
         
@@ -0,0 +1,427 @@
+import argparse
+import json
+import queue
+import selectors
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+# Add the project root to Python path
+project_root = Path(__file__).parent
+sys.path.append(str(project_root))
+
+from core.module_manager import ModuleManager
+from core.chat_manager import ChatManager
+
+class JSONRequestHandler(BaseHTTPRequestHandler):
+    """JSON API over ModuleManager and ChatManager: /modules, /chat and /stats"""
+    
+    # HTTP/1.1 keeps connections open between requests; every response sends Content-Length
+    protocol_version = "HTTP/1.1"
+    
+    # Headers and body are written separately; Nagle would hold the body for the client's delayed ACK
+    disable_nagle_algorithm = True
+    
+    # Seconds a client may take to send the rest of a request once it has started
+    timeout = 5.0
+    
+    # Largest request body accepted, in bytes
+    max_body_size = 1024 * 1024
+    
+    # Most messages answered by one /chat request
+    max_batch_messages = 100
+    
+    server: 'ModuleHTTPServer'
+    
+    def log_message(self, format, *args):
+        """Keep per-request logging off the hot path"""
+        pass
+    
+    def send_json(self, status: int, payload: Any):
+        """Send a JSON response"""
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.count_request(status)
+    
+    def send_error_json(self, status: int, message: str):
+        """Send a JSON error response"""
+        self.send_json(status, {'error': message})
+    
+    def read_json(self) -> Optional[Dict[str, Any]]:
+        """Read the request body as a JSON object, answering 400/413 and returning None if it is not one"""
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.send_error_json(400, "Invalid Content-Length")
+            return None
+        if length > self.max_body_size:
+            # The unread body would corrupt the next request on this connection
+            self.close_connection = True
+            self.send_error_json(413, "Request body too large")
+            return None
+        
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            self.send_error_json(400, f"Invalid JSON: {e}")
+            return None
+        
+        if not isinstance(payload, dict):
+            self.send_error_json(400, "Request body must be a JSON object")
+            return None
+        return payload
+    
+    def do_GET(self):
+        """Route a GET request"""
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        
+        try:
+            if url.path == '/modules':
+                self.send_json(200, {'modules': self.server.module_manager.get_available_modules()})
+            elif url.path == '/stats':
+                self.handle_stats(query.get('module', [None])[0])
+            elif url.path == '/chat':
+                self.send_error_json(405, "Use POST for /chat")
+            else:
+                self.send_error_json(404, f"Unknown endpoint: {url.path}")
+        except Exception as e:
+            print(f"Error handling GET {url.path}: {e}")
+            self.send_error_json(500, str(e))
+    
+    def do_POST(self):
+        """Route a POST request"""
+        url = urlsplit(self.path)
+        
+        # The body is read before anything else so the connection stays usable
+        payload = self.read_json()
+        if payload is None:
+            return
+        
+        if url.path != '/chat':
+            status = 405 if url.path in ('/modules', '/stats') else 404
+            self.send_error_json(status, f"Cannot POST {url.path}")
+            return
+        
+        try:
+            self.handle_chat(payload)
+        except Exception as e:
+            print(f"Error handling POST {url.path}: {e}")
+            self.send_error_json(500, str(e))
+    
+    def handle_stats(self, module_name: Optional[str]):
+        """Send one module's statistics, or server-wide metrics without a module"""
+        module_manager = self.server.module_manager
+        
+        if module_name is None:
+            self.send_json(200, {
+                'server': self.server.get_metrics(),
+                'modules': module_manager.get_cache_metrics(),
+                'writes': ChatManager.get_write_metrics(),
+                'execution': module_manager.get_execution_metrics(),
+                'streaming': module_manager.get_stream_metrics()
+            })
+            return
+        
+        if module_manager.get_module_info(module_name) is None:
+            self.send_error_json(404, f"Unknown module: {module_name}")
+            return
+        
+        stats = module_manager.get_module_stats(module_name)
+        if stats is None:
+            self.send_error_json(500, f"Cannot get statistics for module: {module_name}")
+            return
+        self.send_json(200, {'module': module_name, 'stats': stats})
+    
+    def handle_chat(self, payload: Dict[str, Any]):
+        """Answer one message, or a batch of messages, and save the conversation"""
+        module_name = payload.get('module')
+        if not isinstance(module_name, str):
+            self.send_error_json(400, "'module' must be a module name")
+            return
+        
+        module_manager = self.server.module_manager
+        if module_manager.get_module_info(module_name) is None:
+            self.send_error_json(404, f"Unknown module: {module_name}")
+            return
+        
+        # Clients send a session id to keep their own conversation memory; requests
+        # without one share the default session instead of filling the session store
+        session_id = payload.get('session_id')
+        history = payload.get('history') or []
+        save = payload.get('save', True)
+        if session_id is not None and not isinstance(session_id, str):
+            self.send_error_json(400, "'session_id' must be a string")
+            return
+        if not isinstance(history, list):
+            self.send_error_json(400, "'history' must be a list")
+            return
+        if not isinstance(save, bool):
+            self.send_error_json(400, "'save' must be true or false")
+            return
+        
+        if 'messages' in payload:
+            messages = payload['messages']
+            if not isinstance(messages, list) or not all(isinstance(message, str) for message in messages):
+                self.send_error_json(400, "'messages' must be a list of strings")
+                return
+            if len(messages) > self.max_batch_messages:
+                self.send_error_json(413, f"At most {self.max_batch_messages} messages per request")
+                return
+            
+            responses = module_manager.get_responses(module_name, messages, [history] * len(messages), session_id)
+            if save:
+                for message, response in zip(messages, responses):
+                    self.server.chat_manager.save_conversation(module_name, message, response)
+            self.send_json(200, {'module': module_name, 'session_id': session_id, 'responses': responses})
+            return
+        
+        message = payload.get('message')
+        if not isinstance(message, str):
+            self.send_error_json(400, "'message' must be a string")
+            return
+        
+        response = module_manager.get_response(module_name, message, history, session_id=session_id)
+        if save:
+            self.server.chat_manager.save_conversation(module_name, message, response)
+        self.send_json(200, {'module': module_name, 'session_id': session_id, 'response': response})
+
+class _Connection:
+    """One client connection and the handler parsing its requests"""
+    
+    def __init__(self, server: 'ModuleHTTPServer', request: socket.socket, client_address):
+        self.request = request
+        
+        # BaseRequestHandler.__init__ would serve the whole connection on one thread;
+        # the handler is set up once and serves one request per dispatch instead
+        handler = server.RequestHandlerClass.__new__(server.RequestHandlerClass)
+        handler.request = request
+        handler.client_address = client_address
+        handler.server = server
+        handler.setup()
+        self.handler = handler
+        self.parked_at = time.monotonic()
+    
+    def has_buffered_request(self) -> bool:
+        """Check for request bytes already read into the handler's buffer, without blocking"""
+        self.request.setblocking(False)
+        try:
+            return bool(self.handler.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.request.settimeout(self.handler.timeout)
+
+class ModuleHTTPServer(HTTPServer):
+    """HTTP server serving requests on a bounded worker pool, parking idle keep-alive connections"""
+    
+    # Connections waiting to be accepted before new ones are refused by the OS
+    request_queue_size = 128
+    
+    # Seconds an idle keep-alive connection stays open
+    keep_alive_timeout = 60.0
+    
+    def __init__(self, server_address, module_manager: ModuleManager, workers: int = 16,
+                 handler_class=JSONRequestHandler):
+        super().__init__(server_address, handler_class)
+        self.module_manager = module_manager
+        self.chat_manager = ChatManager()
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http-worker")
+        self._metrics = {
+            'requests': 0,
+            'client_errors': 0,
+            'server_errors': 0,
+            'connections': 0,
+            'open_connections': 0
+        }
+        self._metrics_lock = threading.Lock()
+        
+        # Idle connections wait in a selector, not on a worker; a worker only
+        # takes a connection once it is readable, for one request at a time
+        self._selector = selectors.DefaultSelector()
+        self._to_park: "queue.SimpleQueue[_Connection]" = queue.SimpleQueue()
+        self._wakeup_receiver, self._wakeup_sender = socket.socketpair()
+        self._wakeup_receiver.setblocking(False)
+        self._selector.register(self._wakeup_receiver, selectors.EVENT_READ)
+        self._closing = False
+        self._parking_thread = threading.Thread(target=self._watch_parked, name="http-parking", daemon=True)
+        self._parking_thread.start()
+    
+    def process_request(self, request, client_address):
+        """Park a new connection until its first request arrives"""
+        connection = _Connection(self, request, client_address)
+        with self._metrics_lock:
+            self._metrics['connections'] += 1
+            self._metrics['open_connections'] += 1
+        self._park(connection)
+    
+    def _park(self, connection: _Connection):
+        """Hand a connection to the parking thread"""
+        connection.parked_at = time.monotonic()
+        self._to_park.put(connection)
+        self._wakeup()
+    
+    def _wakeup(self):
+        try:
+            self._wakeup_sender.send(b'\0')
+        except OSError:
+            pass
+    
+    def _watch_parked(self):
+        """Dispatch parked connections to the pool as they become readable, closing idle ones"""
+        next_expiry = time.monotonic() + 1.0
+        
+        while not self._closing:
+            for key, _ in self._selector.select(timeout=1.0):
+                if key.fileobj is self._wakeup_receiver:
+                    try:
+                        while self._wakeup_receiver.recv(4096):
+                            pass
+                    except OSError:
+                        pass
+                    continue
+                
+                self._selector.unregister(key.fileobj)
+                self._dispatch(key.data)
+            
+            while True:
+                try:
+                    connection = self._to_park.get_nowait()
+                except queue.Empty:
+                    break
+                self._selector.register(connection.request, selectors.EVENT_READ, connection)
+            
+            now = time.monotonic()
+            if now >= next_expiry:
+                next_expiry = now + 1.0
+                for key in list(self._selector.get_map().values()):
+                    connection = key.data
+                    if connection is not None and now - connection.parked_at > self.keep_alive_timeout:
+                        self._selector.unregister(key.fileobj)
+                        self._finish(connection)
+        
+        for key in list(self._selector.get_map().values()):
+            if key.data is not None:
+                self._finish(key.data)
+        self._selector.close()
+    
+    def _dispatch(self, connection: _Connection):
+        """Serve a connection's next request on a pooled worker"""
+        try:
+            self._pool.submit(self._serve_request, connection)
+        except RuntimeError:
+            # The pool is shut down
+            self._finish(connection)
+    
+    def _serve_request(self, connection: _Connection):
+        """Serve one request, then park the connection or serve its next buffered request"""
+        handler = connection.handler
+        try:
+            handler.close_connection = True
+            handler.handle_one_request()
+        except Exception:
+            self.handle_error(connection.request, handler.client_address)
+            handler.close_connection = True
+        
+        if handler.close_connection or self._closing:
+            self._finish(connection)
+        elif connection.has_buffered_request():
+            # A pipelined request is already buffered; the selector would not see it
+            self._dispatch(connection)
+        else:
+            self._park(connection)
+    
+    def _finish(self, connection: _Connection):
+        """Close a connection and its handler"""
+        try:
+            connection.handler.finish()
+        except OSError:
+            pass
+        self._close(connection.request)
+    
+    def _close(self, request: socket.socket):
+        self.shutdown_request(request)
+        with self._metrics_lock:
+            self._metrics['open_connections'] -= 1
+    
+    def count_request(self, status: int):
+        """Count a finished request by status class"""
+        with self._metrics_lock:
+            self._metrics['requests'] += 1
+            if 400 <= status < 500:
+                self._metrics['client_errors'] += 1
+            elif status >= 500:
+                self._metrics['server_errors'] += 1
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get request and connection counters"""
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        metrics['workers'] = self.workers
+        metrics['idle_connections'] = max(len(self._selector.get_map()) - 1, 0) if not self._closing else 0
+        return metrics
+    
+    def server_close(self):
+        """Stop listening, close parked connections and stop the worker pool"""
+        super().server_close()
+        self._closing = True
+        self._wakeup()
+        self._parking_thread.join()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        
+        # Connections parked by requests that finished during shutdown
+        while True:
+            try:
+                self._finish(self._to_park.get_nowait())
+            except queue.Empty:
+                break
+        self._wakeup_sender.close()
+        self._wakeup_receiver.close()
+
+def create_server(host: str = "127.0.0.1", port: int = 8000, workers: int = 16,
+                  module_manager: Optional[ModuleManager] = None) -> ModuleHTTPServer:
+    """Create a JSON API server on the shared ModuleManager"""
+    if module_manager is None:
+        module_manager = ModuleManager.shared()
+    return ModuleHTTPServer((host, port), module_manager, workers)
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve AI Forge modules as a JSON API")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="port to listen on")
+    parser.add_argument("--workers", type=int, default=16, help="worker threads serving connections")
+    parser.add_argument("--watch", action="store_true", help="reload modules edited in moduls/")
+    args = parser.parse_args()
+    
+    # Persist conversations and learning off the response path
+    ChatManager.enable_write_behind()
+    
+    module_manager = ModuleManager.shared()
+    if args.watch:
+        module_manager.start_watcher()
+    
+    server = create_server(args.host, args.port, args.workers, module_manager)
+    print(f"Serving {len(module_manager.get_available_modules())} modules on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        ChatManager.disable_write_behind()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Concurrent sessions through the asyncio API of ModuleManager and ChatManager"""
+import asyncio
+import shutil
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.chat_manager import ChatManager
+from core.module_manager import ModuleManager
+
+MODULE = "A.v.A"
+SESSIONS = 40
+TURNS = 5
+
+def session_word(number: int) -> str:
+    """A word only one session uses, letters only so it survives concept extraction"""
+    return "quasar" + "".join(chr(ord('a') + int(digit)) for digit in f"{number:03d}")
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run against a copy of the modules so learning data stays out of data/"""
+    shutil.copytree(project_root / "moduls", tmp_path / "moduls", ignore=shutil.ignore_patterns("__pycache__"))
+    monkeypatch.chdir(tmp_path)
+    ChatManager.enable_write_behind()
+    yield tmp_path
+    ChatManager.disable_write_behind()
+
+async def run_session(manager: ModuleManager, chat_manager: ChatManager, number: int):
+    """Hold one conversation, saving every turn"""
+    session_id = f"session-{number}"
+    history = []
+    for turn in range(TURNS):
+        user_input = f"{session_word(number)} questions"
+        response = await manager.aget_response(MODULE, user_input, history, session_id=session_id)
+        await chat_manager.asave_conversation(MODULE, user_input, response)
+        history += [{"role": "user", "content": user_input}, {"role": "assistant", "content": response}]
+
+async def run_sessions(manager: ModuleManager, chat_manager: ChatManager, peak_threads: list):
+    """Run every session concurrently while sampling the thread count"""
+    done = asyncio.Event()
+    
+    async def sample_threads():
+        while not done.is_set():
+            peak_threads.append(threading.active_count())
+            await asyncio.sleep(0.001)
+    
+    sampler = asyncio.create_task(sample_threads())
+    await asyncio.gather(*(run_session(manager, chat_manager, number) for number in range(SESSIONS)))
+    assert await chat_manager.aflush(timeout=30)
+    done.set()
+    await sampler
+
+def test_concurrent_sessions(workdir):
+    manager = ModuleManager()
+    chat_manager = ChatManager()
+    threads_before = threading.active_count()
+    peak_threads = []
+    
+    asyncio.run(run_sessions(manager, chat_manager, peak_threads))
+    
+    # Each session's conversation memory holds its own topic and no other session's
+    module_instance = manager.loaded_modules[MODULE]
+    words = {session_word(number) for number in range(SESSIONS)}
+    for number in range(SESSIONS):
+        topics = " ".join(module_instance.sessions.get(f"session-{number}")['discussed_topics'])
+        assert {word for word in words if word in topics} == {session_word(number)}
+    
+    # aflush waited for every queued conversation row
+    stats = chat_manager.get_module_stats(MODULE)
+    assert stats['total_conversations'] == SESSIONS * TURNS
+    assert len(chat_manager.get_conversations(MODULE, limit=SESSIONS * TURNS + 1)) == SESSIONS * TURNS
+    
+    # Blocking calls ran on the bounded executors, not a thread per session
+    bound = threads_before + ModuleManager.ASYNC_WORKERS + ChatManager.ASYNC_WORKERS
+    assert max(peak_threads) <= bound < SESSIONS
@@ -0,0 +1,95 @@
+"""Batched responses against the single-input path"""
+import os
+import random
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.chat_manager import ChatManager
+from core.module_manager import ModuleManager
+
+MODULE = "A.v.A"
+
+# Repeated inputs make later turns depend on what earlier turns learned
+INPUTS = [
+    "tell me about physics and energy", "what is physics", "tell me about physics and energy",
+    "hello there friend", "hello there friend", "what is 3 + 4", "what is 3 + 4",
+    "why is the sky blue", "I feel sad", "why is the sky blue",
+    "compare python and java", "compare python and java", "bye"
+]
+
+def run_in(directory: Path, respond) -> tuple:
+    """Answer INPUTS in a fresh copy of the modules; returns the responses and the learned data"""
+    directory.mkdir()
+    shutil.copytree(project_root / "moduls", directory / "moduls", ignore=shutil.ignore_patterns("__pycache__"))
+    os.chdir(directory)
+    
+    manager = ModuleManager()
+    manager.load_module(MODULE)
+    # Small commits, so the batch spans several transactions
+    manager.loaded_modules[MODULE].batch_commit_size = 4
+    
+    random.seed(1)
+    responses = respond(manager)
+    learned = sorted(
+        (row['pattern'], row['response'], row['usage_count'], row['confidence'])
+        for row in ChatManager().get_learning_data(MODULE)
+    )
+    return responses, learned
+
+def test_batch_matches_single_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    single = run_in(tmp_path / "single", lambda manager: [
+        manager.get_response(MODULE, user_input, [], session_id="s") for user_input in INPUTS
+    ])
+    batch = run_in(tmp_path / "batch", lambda manager: manager.get_responses(MODULE, INPUTS, session_id="s"))
+    
+    assert batch[0] == single[0]
+    assert batch[1] == single[1]
+
+def test_batch_commits_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    transactions = []
+    transaction = ChatManager.transaction
+    
+    def counting_transaction(self, module_name):
+        transactions.append(module_name)
+        return transaction(self, module_name)
+    
+    monkeypatch.setattr(ChatManager, 'transaction', counting_transaction)
+    responses, _ = run_in(tmp_path / "batch", lambda manager: manager.get_responses(MODULE, INPUTS))
+    
+    assert len(responses) == len(INPUTS)
+    assert transactions == [MODULE] * 4
+
+def test_transaction_only_blocks_its_own_database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    chat_manager = ChatManager()
+    chat_manager.init_module_database("Other")
+    opened, release = threading.Event(), threading.Event()
+    
+    def hold_transaction():
+        with chat_manager.transaction(MODULE):
+            opened.set()
+            release.wait(5)
+    
+    holder = threading.Thread(target=hold_transaction)
+    holder.start()
+    try:
+        assert opened.wait(5)
+        started = time.perf_counter()
+        chat_manager.save_conversation("Other", "hi", "hello")
+        assert time.perf_counter() - started < 1.0
+    finally:
+        release.set()
+        holder.join()
+    
+    assert chat_manager.get_module_stats("Other")['total_conversations'] == 1
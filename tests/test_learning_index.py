@@ -0,0 +1,58 @@
+"""The in-memory learning index against writes from other connections and processes"""
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.chat_manager import ChatManager
+
+MODULE = "Index Test"
+
+@pytest.fixture
+def chat_manager(tmp_path, monkeypatch):
+    """A ChatManager writing to a fresh data/ directory"""
+    monkeypatch.chdir(tmp_path)
+    return ChatManager()
+
+def responses(chat_manager: ChatManager, text: str):
+    """Map each candidate pattern for text to its response"""
+    return {entry['pattern']: entry['response']
+            for entry in chat_manager.get_learning_index(MODULE).candidates(text)}
+
+def test_index_sees_commits_from_another_process(chat_manager, tmp_path):
+    chat_manager.save_learning_data(MODULE, "zebra", "taught zebra")
+    assert responses(chat_manager, "zebra") == {"zebra": "taught zebra"}
+    
+    # Another process learns through its own ChatManager and connections
+    subprocess.run([sys.executable, "-c", (
+        "import sys; sys.path.append(sys.argv[1]); "
+        "from core.chat_manager import ChatManager; "
+        "ChatManager().save_learning_batch(sys.argv[2], ['zebra', 'zebra crossing'], 'striped')"
+    ), str(project_root), MODULE], cwd=tmp_path, check=True)
+    
+    assert responses(chat_manager, "zebra") == {"zebra": "striped", "zebra crossing": "striped"}
+    
+    # Writes of this process keep applying to the rebuilt index
+    chat_manager.save_learning_data(MODULE, "zebra stripes", "black and white")
+    assert responses(chat_manager, "zebra")["zebra stripes"] == "black and white"
+
+def test_index_sees_deletes_through_another_connection(chat_manager):
+    chat_manager.save_learning_batch(MODULE, ["lion", "lion king"], "roar")
+    index = chat_manager.get_learning_index(MODULE)
+    assert set(responses(chat_manager, "lion")) == {"lion", "lion king"}
+    
+    with sqlite3.connect(chat_manager.get_module_db_path(MODULE)) as conn:
+        conn.execute("DELETE FROM learning_data WHERE pattern = 'lion king'")
+    
+    assert set(responses(chat_manager, "lion")) == {"lion"}
+    assert chat_manager.get_learning_index(MODULE) is not index
+    
+    # An unchanged database keeps the cached index
+    rebuilt = chat_manager.get_learning_index(MODULE)
+    assert chat_manager.get_learning_index(MODULE) is rebuilt
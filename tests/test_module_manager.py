@@ -0,0 +1,54 @@
+"""Loading, eviction and reloading of module instances by ModuleManager"""
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.module_manager import ModuleManager
+
+MODULE = "A.v.A"
+
+ECHO_MODULE = '''
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+from base_module import BaseAIModule
+
+class AIModule(BaseAIModule):
+    name = "Echo"
+    version = "1.0.0"
+    description = "Repeats the input"
+    
+    def generate_response(self, user_input, chat_history):
+        return user_input
+'''
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run against a copy of the modules plus a second, trivial module"""
+    shutil.copytree(project_root / "moduls", tmp_path / "moduls", ignore=shutil.ignore_patterns("__pycache__"))
+    (tmp_path / "moduls" / "echo_module.py").write_text(ECHO_MODULE)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def test_capacity_eviction_keeps_session_memory(workdir):
+    manager = ModuleManager(max_loaded_modules=1)
+    manager.get_response(MODULE, "tell me about astronomy", [], session_id="alice")
+    evicted = manager.loaded_modules[MODULE]
+    topics = list(evicted.sessions.get("alice")['discussed_topics'])
+    assert topics
+    
+    # Loading a second module evicts A.v.A; using it again reloads a fresh instance
+    assert manager.get_response("Echo", "hi", [], session_id="bob") == "hi"
+    assert MODULE not in manager.loaded_modules
+    manager.get_response(MODULE, "and what about music", [], session_id="alice")
+    
+    reloaded = manager.loaded_modules[MODULE]
+    assert reloaded is not evicted
+    assert manager.get_cache_metrics()['reloads'] == 1
+    assert reloaded.sessions.get("alice")['discussed_topics'][:len(topics)] == topics
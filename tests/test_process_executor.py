@@ -0,0 +1,51 @@
+"""Worker process lifecycle of ProcessExecutor"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.process_executor import ProcessExecutor
+
+SLOW_INIT_MODULE = '''
+import time
+
+class AIModule:
+    def __init__(self):
+        time.sleep(1.0)
+    
+    def generate_response(self, user_input, chat_history):
+        return "echo " + user_input
+'''
+
+@pytest.fixture
+def module_file(tmp_path, monkeypatch):
+    """A module that takes a second to initialize"""
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "slow_init_module.py"
+    path.write_text(SLOW_INIT_MODULE)
+    return path
+
+def test_call_after_shutdown_returns_fallback(module_file):
+    executor = ProcessExecutor(max_workers=2, timeout=5.0)
+    executor.shutdown()
+    assert executor.call(module_file, "hash", "hi", [], "session") == ProcessExecutor.CLOSED_MESSAGE
+    assert executor.call(module_file, "hash", "hi", []) == ProcessExecutor.CLOSED_MESSAGE
+
+def test_recycled_worker_warms_up_outside_the_deadline(module_file):
+    executor = ProcessExecutor(max_workers=1, timeout=0.5, max_calls_per_worker=1)
+    try:
+        # The first worker loads the module cold, within a generous deadline
+        assert executor.call(module_file, "hash", "one", [], timeout=10.0) == "echo one"
+        
+        # Its replacement loads the module before taking the call, so the
+        # one-second init does not count against the half-second deadline
+        assert executor.call(module_file, "hash", "two", []) == "echo two"
+        metrics = executor.get_metrics()
+        assert metrics['recycled_workers'] == 2
+        assert metrics['timeouts'] == 0
+    finally:
+        executor.shutdown()
@@ -0,0 +1,61 @@
+"""Request validation and sessions of the JSON API server"""
+import http.client
+import json
+import shutil
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.module_manager import ModuleManager
+from server import JSONRequestHandler, create_server
+
+MODULE = "A.v.A"
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """A running server over a copy of the modules"""
+    shutil.copytree(project_root / "moduls", tmp_path / "moduls", ignore=shutil.ignore_patterns("__pycache__"))
+    monkeypatch.chdir(tmp_path)
+    server = create_server(port=0, workers=2, module_manager=ModuleManager())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def post_chat(server, payload: dict):
+    """POST payload to /chat, returning the status and decoded body"""
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+    try:
+        conn.request("POST", "/chat", json.dumps(payload), {'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        conn.close()
+
+def test_anonymous_requests_share_the_default_session(server):
+    status, body = post_chat(server, {'module': MODULE, 'message': "hello", 'session_id': "alice"})
+    assert status == 200 and body['session_id'] == "alice"
+    
+    for _ in range(5):
+        status, body = post_chat(server, {'module': MODULE, 'message': "hello"})
+        assert status == 200 and body['session_id'] is None
+    
+    # Only alice's session and the default one hold conversation memory
+    assert len(server.module_manager.loaded_modules[MODULE].sessions) == 2
+
+def test_chat_rejects_invalid_fields(server):
+    too_many = ["hi"] * (JSONRequestHandler.max_batch_messages + 1)
+    assert post_chat(server, {'module': MODULE, 'messages': too_many})[0] == 413
+    assert post_chat(server, {'module': MODULE, 'message': "hi", 'save': "no"})[0] == 400
+    assert post_chat(server, {'module': MODULE, 'message': "hi", 'session_id': 7})[0] == 400
+    assert post_chat(server, {'module': MODULE, 'message': "hi", 'history': "none"})[0] == 400
+    
+    status, _ = post_chat(server, {'module': MODULE, 'message': "hi", 'save': False})
+    assert status == 200
+    assert server.chat_manager.get_module_stats(MODULE)['total_conversations'] == 0
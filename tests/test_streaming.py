@@ -0,0 +1,81 @@
+"""Streamed A.v.A responses against whole ones, and learning from abandoned streams"""
+import os
+import random
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.chat_manager import ChatManager
+from core.module_manager import ModuleManager
+
+MODULE = "A.v.A"
+
+INPUTS = [
+    "what is quantum physics and energy", "analyze the economy market trends", "what is 3 + 4",
+    "hello", "compare python and java", "what is quantum physics and energy"
+]
+
+def fresh_manager(directory: Path) -> ModuleManager:
+    """A ModuleManager over a fresh copy of the modules"""
+    directory.mkdir()
+    shutil.copytree(project_root / "moduls", directory / "moduls", ignore=shutil.ignore_patterns("__pycache__"))
+    os.chdir(directory)
+    return ModuleManager()
+
+def learned_rows():
+    """The learned rows of the module, comparable across runs"""
+    return sorted(
+        (row['pattern'], row['response'], row['usage_count'], row['confidence'])
+        for row in ChatManager().get_learning_data(MODULE)
+    )
+
+def test_stream_matches_whole_response(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    
+    manager = fresh_manager(tmp_path / "whole")
+    random.seed(3)
+    whole = [manager.get_response(MODULE, user_input, [], session_id="s") for user_input in INPUTS]
+    whole_learned = learned_rows()
+    
+    manager = fresh_manager(tmp_path / "stream")
+    random.seed(3)
+    streamed = [''.join(manager.get_response_stream(MODULE, user_input, [], session_id="s"))
+                for user_input in INPUTS]
+    
+    assert streamed == whole
+    assert learned_rows() == whole_learned
+
+def test_parts_are_yielded_as_composed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = fresh_manager(tmp_path / "parts")
+    manager.load_module(MODULE)
+    module_instance = manager.loaded_modules[MODULE]
+    
+    parts = module_instance.stream_analysis_response(module_instance.analyze_input(INPUTS[0]), [])
+    first = next(parts)
+    assert first.endswith(". ") and "Let me analyze this further" not in first
+    parts.close()
+
+def test_abandoned_stream_is_still_learned(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    
+    manager = fresh_manager(tmp_path / "whole")
+    random.seed(5)
+    whole = manager.get_response(MODULE, INPUTS[0], [], session_id="s")
+    whole_learned = learned_rows()
+    
+    manager = fresh_manager(tmp_path / "abandoned")
+    random.seed(5)
+    stream = manager.get_response_stream(MODULE, INPUTS[0], [], session_id="s")
+    first_chunk = next(stream)
+    stream.close()
+    
+    assert whole.startswith(first_chunk)
+    assert learned_rows() == whole_learned
+    assert manager.get_stream_metrics(MODULE)['streams'] == 1